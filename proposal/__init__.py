@@ -0,0 +1,47 @@
+"""
+SnapAndSend proposal deck generator.
+
+Decks are described as data (`proposal.spec`, with the standard proposal in
+`proposal/specs/snapandsend.json`), rendered onto shared template layouts
+(`proposal.templates`) by the builders in `proposal.builders`, and reuse
+unchanged slides from an on-disk cache (`proposal.cache`). Many tailored
+decks can be produced at once with `proposal.batch`.
+
+Importing this package is cheap: python-pptx and lxml are only imported
+once a deck is actually rendered.
+"""
+
+from .cache import DEFAULT_CACHE_DIR
+from .spec import DEFAULT_SPEC_PATH, SpecError, load_spec, validate_spec
+
+__all__ = ["DEFAULT_CACHE_DIR", "DEFAULT_SPEC_PATH", "SpecError", "build_deck", "load_spec", "validate_spec"]
+
+
+def build_deck(spec=DEFAULT_SPEC_PATH, out="SnapAndSend_Proposal.pptx", cache_dir=DEFAULT_CACHE_DIR,
+               compression="deflated", compress_level=None, deterministic=False, profiler=None, backend="pptx"):
+    """Render `spec` and save the deck to `out`.
+
+    `spec` is a path to a spec file or an already loaded spec mapping. `out`
+    is a path, a writable binary stream or "-" for stdout; see
+    `proposal.writer.save_deck()` for the compression and determinism
+    options. Unchanged slides are reused from `cache_dir`; pass None to
+    render every slide from scratch. `backend="compiled"` builds the
+    text-and-shape slides from XML templates (`proposal.compiled`) instead of
+    the python-pptx object model. A `proposal.profiling.Profiler` records
+    per-slide and save timings. Returns the Presentation that was saved.
+    """
+    if isinstance(spec, (str, bytes)) or hasattr(spec, "__fspath__"):
+        spec = load_spec(spec)
+    validate_spec(spec)
+
+    from .cache import SlideCache
+    from .render import build_presentation
+    from .writer import save_deck
+
+    cache = SlideCache(cache_dir) if cache_dir else None
+    prs = build_presentation(spec["slides"], cache, profiler=profiler, backend=backend)
+    save_deck(
+        prs, out,
+        compression=compression, compress_level=compress_level, deterministic=deterministic, profiler=profiler,
+    )
+    return prs
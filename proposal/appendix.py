@@ -0,0 +1,102 @@
+"""
+Incident appendix: every report in the database as a paginated table.
+
+Rows are streamed from a SQLite cursor over `Report` and cut into pages of
+`ROWS_PER_SLIDE`, so only one page of rows is ever held in Python no matter
+how many incidents there are. Timestamps are formatted by SQLite in the same
+query. Each page becomes an ordinary `table` slide spec; rendered with the
+compiled backend (`proposal.compiled`), a page is one string template fill
+and one parse instead of a python-pptx call per cell, which is what makes
+tens of thousands of rows practical.
+"""
+
+from contextlib import closing
+from itertools import islice
+
+from .datasource import connect, epoch_ms, parse_since
+
+INCIDENT_COLUMNS = ["ID", "Category", "Status", "Reported", "Investigating", "Resolved", "Verifications"]
+INCIDENT_COLUMN_WIDTHS = [2.5, 1.8, 1.4, 1.8, 1.8, 1.8, 1.3]
+
+# Header plus 12 rows of 0.4" fill the content area above the footer
+ROWS_PER_SLIDE = 12
+
+
+def _timestamp(column):
+    # Minutes in UTC, or a dash for transitions that haven't happened
+    return f"IFNULL(strftime('%Y-%m-%d %H:%M', {epoch_ms(column)} / 1000.0, 'unixepoch'), '–')"
+
+
+def _where(since, status):
+    clauses, params = [], []
+    if since is not None:
+        clauses.append(f"{epoch_ms('createdAt')} >= ?")
+        params.append(since.timestamp() * 1000)
+    if status is not None:
+        clauses.append("status = ?")
+        params.append(status)
+    return (f" WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+def count_incidents(path=None, since=None, status=None):
+    where, params = _where(since, status)
+    with closing(connect(path)) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM Report{where}", params).fetchone()[0]
+
+
+def iter_incident_rows(path=None, since=None, status=None):
+    """Yield one row of `INCIDENT_COLUMNS` per report, oldest first, straight off the cursor."""
+    where, params = _where(since, status)
+    with closing(connect(path)) as conn:
+        cursor = conn.execute(
+            f"SELECT id, category, status, {_timestamp('createdAt')}, {_timestamp('investigatingAt')}, "
+            f"{_timestamp('resolvedAt')}, agreementCount "
+            f"FROM Report{where} ORDER BY {epoch_ms('createdAt')}, id",
+            params,
+        )
+        yield from cursor
+
+
+def paginate(rows, rows_per_slide=ROWS_PER_SLIDE):
+    """Yield lists of up to `rows_per_slide` rows taken from the iterable `rows`."""
+    rows = iter(rows)
+    while True:
+        page = list(islice(rows, rows_per_slide))
+        if not page:
+            return
+        yield page
+
+
+def table_slides(rows, title, columns, column_widths=None, rows_per_slide=ROWS_PER_SLIDE, total=None, slide_id=None):
+    """Yield `table` slide specs paging through the iterable `rows`.
+
+    With `total` (the number of rows), titles are numbered "page/pages".
+    """
+    pages = -(-total // rows_per_slide) if total else None
+    for number, page in enumerate(paginate(rows, rows_per_slide), start=1):
+        spec = {
+            "kind": "table",
+            "title": f"{title} ({number}/{pages})" if pages else f"{title} ({number})",
+            "columns": columns,
+            "rows": page,
+        }
+        if column_widths:
+            spec["column_widths"] = column_widths
+        if slide_id:
+            spec["id"] = f"{slide_id}-{number}"
+        yield spec
+
+
+def expand_incidents_slide(spec):
+    """Lazily expand an `incidents` spec into table slides listing every matching report."""
+    since = parse_since(spec.get("since"))
+    path, status = spec.get("database"), spec.get("status")
+    yield from table_slides(
+        iter_incident_rows(path, since, status),
+        spec.get("title", "Incident Appendix"),
+        INCIDENT_COLUMNS,
+        INCIDENT_COLUMN_WIDTHS,
+        spec.get("rows_per_slide", ROWS_PER_SLIDE),
+        total=count_incidents(path, since, status),
+        slide_id=spec.get("id"),
+    )
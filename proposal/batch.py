@@ -0,0 +1,162 @@
+"""
+Render many tailored proposal decks in parallel.
+
+A manifest is a JSON list of variants (see `proposal.spec.apply_variant`),
+each optionally carrying a `name` used for its output file:
+
+    [
+        {"name": "lagos-island", "region": "Lagos Island LGA", "contact": "ops@tech84.ng",
+         "categories": ["Flooding", "Potholes"], "stats": {"Reports this month": 412}},
+        ...
+    ]
+
+Usage:
+
+    python -m proposal.batch manifest.json --out-dir decks/ [--workers N] [--spec FILE] [--cache-dir DIR]
+                             [--backend {pptx,compiled}]
+
+Worker processes are started once and reused for every deck. Each worker
+loads the slide spec and pre-builds the template layouts in its initializer,
+so per-deck cost is only the slides themselves and the save. Slides that
+are identical across variants are rendered once and then spliced in from
+the shared slide cache.
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Per-worker state, filled in by _init_worker()
+_worker_slides = None
+_worker_template = None
+_worker_cache = None
+_worker_save_options = None
+_worker_backend = None
+
+
+def _init_worker(slides, cache_dir, save_options, backend):
+    global _worker_slides, _worker_template, _worker_cache, _worker_save_options, _worker_backend
+    from .cache import SlideCache
+    from .templates import template_blob
+
+    _worker_slides = slides
+    _worker_template = template_blob()
+    _worker_cache = SlideCache(cache_dir) if cache_dir else None
+    _worker_save_options = save_options
+    _worker_backend = backend
+
+
+def _render_variant(task):
+    from .render import build_presentation
+    from .spec import apply_variant
+    from .writer import save_deck
+
+    variant, out_path = task
+    start = time.perf_counter()
+    prs = build_presentation(
+        apply_variant(_worker_slides, variant), _worker_cache,
+        template=io.BytesIO(_worker_template), backend=_worker_backend,
+    )
+    save_deck(prs, out_path, **_worker_save_options)
+    return out_path, time.perf_counter() - start
+
+
+def variant_filename(variant, index):
+    """Return a filesystem-safe `.pptx` name for `variant`."""
+    name = variant.get("name") or variant.get("region") or f"deck-{index:04d}"
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", name).strip("-").lower() or f"deck-{index:04d}"
+    return f"{slug}.pptx"
+
+
+def _unique_filenames(variants):
+    # Variants sharing a name or region would otherwise overwrite each
+    # other's deck; later ones get "-2", "-3", ... appended
+    filenames, seen = [], set()
+    for i, variant in enumerate(variants):
+        filename = variant_filename(variant, i)
+        stem, n = filename[:-len(".pptx")], 2
+        while filename in seen:
+            filename = f"{stem}-{n}.pptx"
+            n += 1
+        seen.add(filename)
+        filenames.append(filename)
+    return filenames
+
+
+def render_batch(variants, out_dir, slides=None, workers=None, chunksize=4, cache_dir=None, backend="pptx",
+                 **save_options):
+    """Render one deck per variant into `out_dir` and return a summary dict.
+
+    Decks are named by `variant_filename()`, numbered from "-2" on when
+    several variants would share a name. `backend` selects how slides are
+    built (see `proposal.render`); `save_options` are passed on to
+    `proposal.writer.save_deck()`.
+    """
+    if slides is None:
+        from .spec import load_spec, validate_spec
+        slides = validate_spec(load_spec())["slides"]
+
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [
+        (variant, os.path.join(out_dir, filename))
+        for variant, filename in zip(variants, _unique_filenames(variants))
+    ]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(slides, cache_dir, save_options, backend)) as pool:
+        results = list(pool.map(_render_variant, tasks, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    render_times = [seconds for _, seconds in results]
+    return {
+        "decks": len(results),
+        "elapsed": elapsed,
+        "decks_per_sec": len(results) / elapsed if elapsed else 0.0,
+        "mean_render_sec": sum(render_times) / len(render_times) if render_times else 0.0,
+        "outputs": [path for path, _ in results],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render tailored proposal decks in parallel.")
+    parser.add_argument("manifest", help="JSON list of deck variants")
+    parser.add_argument("--out-dir", default="decks", help="directory for the rendered decks")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=4, help="variants handed to a worker at a time")
+    parser.add_argument("--spec", default=None, help="deck spec shared by every variant (default: the standard proposal)")
+    parser.add_argument("--cache-dir", default=None, help="slide cache shared by the workers")
+    parser.add_argument("--backend", choices=("pptx", "compiled"), default="pptx", help="slide building backend")
+    parser.add_argument("--compression", choices=("deflated", "stored"), default="deflated", help="ZIP compression")
+    parser.add_argument("--deterministic", action="store_true", help="byte-identical output for identical variants")
+    args = parser.parse_args(argv)
+
+    from .spec import DEFAULT_SPEC_PATH, load_spec, validate_spec
+
+    # Checked before any worker starts, so a bad spec fails once, not per deck
+    try:
+        with open(args.manifest, encoding="utf-8") as f:
+            variants = json.load(f)
+        slides = validate_spec(load_spec(args.spec or DEFAULT_SPEC_PATH))["slides"]
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    summary = render_batch(
+        variants, args.out_dir, slides=slides, workers=args.workers,
+        chunksize=args.chunksize, cache_dir=args.cache_dir, backend=args.backend,
+        compression=args.compression, deterministic=args.deterministic,
+    )
+    print(
+        f"Rendered {summary['decks']} decks in {summary['elapsed']:.2f}s "
+        f"({summary['decks_per_sec']:.1f} decks/sec, {summary['mean_render_sec'] * 1000:.0f} ms/deck per worker)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""
+Benchmark the slide builders on synthetic decks.
+
+For every builder kind and deck size this builds a deck of that many slides
+and reports:
+
+- `slides_per_sec`: build plus save throughput
+- `peak_rss_bytes`: growth of the process's peak RSS during build and save
+- `peak_mem_bytes`: peak traced Python allocation (tracemalloc); lxml's own
+  allocations are invisible to tracemalloc, which is why RSS is reported too
+- `shapes_per_slide`: shapes on each slide, excluding the layout chrome
+- `bytes_per_slide`: compressed size of each slide's XML and rels in the .pptx
+
+Usage:
+
+    python -m proposal.bench [--sizes 10,100,1000,10000] [--kinds content,workflow]
+                             [--out results.json] [--baseline bench_baseline.json]
+                             [--threshold 0.15] [--save-baseline bench_baseline.json]
+                             [--backend {pptx,compiled}]
+
+Each kind/size is measured in a fresh worker process so peak RSS is not
+inherited from earlier runs. With `--baseline`, the run exits non-zero when
+any kind/size measured in the baseline regresses past `--threshold`:
+throughput drops, or memory or size grows, by more than that fraction.
+"""
+
+import argparse
+import io
+import json
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+# Kinds `synthetic_slide()` can make specs for; picture kinds need image files
+SYNTHETIC_KINDS = ("title", "section", "content", "two_column", "workflow", "chart", "table", "timeline")
+
+# metric -> True when higher is better
+METRICS = {
+    "slides_per_sec": True,
+    "peak_rss_bytes": False,
+    "peak_mem_bytes": False,
+    "bytes_per_slide": False,
+}
+
+
+def _words(i, count):
+    vocabulary = ("incident", "report", "verified", "community", "resolution", "pothole",
+                  "evidence", "authority", "status", "response", "district", "timeline")
+    return " ".join(vocabulary[(i + j) % len(vocabulary)] for j in range(count)).capitalize()
+
+
+def synthetic_slide(kind, i):
+    """Return a deterministic spec for slide `i` of the given kind."""
+    if kind == "title":
+        return {"kind": "title", "title": f"Proposal {i}", "subtitle": _words(i, 8)}
+    if kind == "section":
+        return {"kind": "section", "title": f"Section {i}: {_words(i, 3)}"}
+    if kind == "content":
+        return {"kind": "content", "title": f"Content {i}", "content_items": [
+            {"title": _words(i + n, 3), "desc": _words(i + n, 12)} for n in range(5)
+        ]}
+    if kind == "two_column":
+        return {"kind": "two_column", "title": f"Overview {i}",
+                "left_title": "Citizens", "left_items": [_words(i + n, 5) for n in range(8)],
+                "right_title": "Authorities", "right_items": [_words(i + n + 3, 5) for n in range(8)]}
+    if kind == "workflow":
+        return {"kind": "workflow", "title": f"Workflow {i}", "steps": [
+            {"title": _words(i + n, 1), "desc": _words(i + n, 10)} for n in range(5)
+        ]}
+    if kind == "chart":
+        return {"kind": "chart", "title": f"Chart {i}", "categories": [_words(i + n, 1) for n in range(6)],
+                "series": {"Reports": [(i * 7 + n * 13) % 50 for n in range(6)]}}
+    if kind == "table":
+        return {"kind": "table", "title": f"Table {i}", "columns": ["Report", "Category", "Status"],
+                "rows": [[f"r{i}-{n}", _words(i + n, 1), _words(i + n + 5, 1)] for n in range(10)]}
+    if kind == "timeline":
+        return {"kind": "timeline", "title": f"Timeline {i}", "lanes": [
+            {"label": f"r{i}-{n}", "events": [
+                {"at": 0, "status": "pending"},
+                {"at": (i + n) % 24 + 1, "status": "investigating", "by": "ops"},
+                {"at": (i + n) % 24 + 30, "status": "resolved", "by": "ops"},
+            ]} for n in range(8)
+        ]}
+    raise ValueError(f"unknown slide kind {kind!r}")
+
+
+def _build_and_save(slides, backend="pptx"):
+    from .render import build_presentation
+    from .writer import save_deck
+
+    prs = build_presentation(slides, backend=backend)
+    stream = io.BytesIO()
+    save_deck(prs, stream)
+    return prs, stream.getvalue()
+
+
+def _slide_bytes(blob):
+    with zipfile.ZipFile(io.BytesIO(blob)) as zf:
+        return sum(
+            info.compress_size for info in zf.infolist()
+            if info.filename.startswith("ppt/slides/")
+        )
+
+
+def _max_rss_bytes():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def measure(kind, size, trace_memory=True, backend="pptx"):
+    """Return the metrics for a `size`-slide deck of `kind` slides built with `backend`."""
+    slides = [synthetic_slide(kind, i) for i in range(size)]
+    _build_and_save(slides[:1], backend)  # warm imports and template parsing
+    rss_before = _max_rss_bytes()
+
+    start = time.perf_counter()
+    prs, blob = _build_and_save(slides, backend)
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "kind": kind,
+        "size": size,
+        "backend": backend,
+        "seconds": elapsed,
+        "slides_per_sec": size / elapsed,
+        "peak_rss_bytes": _max_rss_bytes() - rss_before,
+        "shapes_per_slide": sum(len(slide.shapes) for slide in prs.slides) / size,
+        "bytes_per_slide": _slide_bytes(blob) / size,
+        "file_bytes": len(blob),
+    }
+    del prs, blob
+
+    if trace_memory:
+        # Separate pass: tracing slows allocation down too much to time alongside it
+        tracemalloc.start()
+        _build_and_save(slides, backend)
+        result["peak_mem_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def _label(entry):
+    return f"{entry['kind']}@{entry['size']} ({entry.get('backend', 'pptx')})"
+
+
+def compare(results, baseline, threshold):
+    """Return `(regressions, unmatched)` of `results` against `baseline`.
+
+    `regressions` are human-readable lines; `unmatched` labels the results
+    the baseline has no entry for (same kind, size and backend).
+    """
+    def key(entry):
+        return entry["kind"], entry["size"], entry.get("backend", "pptx")
+
+    previous = {key(entry): entry for entry in baseline["results"]}
+    regressions, unmatched = [], []
+    for entry in results:
+        base = previous.get(key(entry))
+        if base is None:
+            unmatched.append(_label(entry))
+            continue
+        for metric, higher_is_better in METRICS.items():
+            if metric not in entry or metric not in base or not base[metric]:
+                continue
+            change = (entry[metric] - base[metric]) / base[metric]
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(
+                    f"{_label(entry)}: {metric} {base[metric]:,.1f} -> {entry[metric]:,.1f} ({change:+.1%})"
+                )
+    return regressions, unmatched
+
+
+def measure_isolated(kind, size, trace_memory=True, backend="pptx"):
+    """Run `measure()` in a fresh process and return its result."""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(measure, kind, size, trace_memory, backend).result()
+
+
+def _print_header(out):
+    print(f"{'kind':<11} {'size':>6} {'slides/s':>10} {'RSS MB':>8} {'traced MB':>10} {'shapes':>7} {'B/slide':>9}",
+          file=out)
+
+
+def _print_row(entry, out):
+    traced = entry.get("peak_mem_bytes")
+    print(
+        f"{entry['kind']:<11} {entry['size']:>6} {entry['slides_per_sec']:>10.1f} "
+        f"{entry['peak_rss_bytes'] / 2**20:>8.1f} "
+        f"{traced / 2**20 if traced is not None else float('nan'):>10.1f} "
+        f"{entry['shapes_per_slide']:>7.1f} {entry['bytes_per_slide']:>9.0f}",
+        file=out,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the proposal slide builders.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma-separated deck sizes")
+    parser.add_argument("--kinds", default=",".join(SYNTHETIC_KINDS), help="comma-separated slide kinds")
+    parser.add_argument("--backend", choices=("pptx", "compiled"), default="pptx", help="slide building backend")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed regression fraction (default: %(default)s)")
+    parser.add_argument("--save-baseline", help="write results as the new baseline to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    _print_header(sys.stderr)
+    for kind in args.kinds.split(","):
+        for size in (int(s) for s in args.sizes.split(",")):
+            results.append(measure_isolated(kind, size, trace_memory=not args.no_memory, backend=args.backend))
+            _print_row(results[-1], sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions, unmatched = compare(results, json.load(f), args.threshold)
+        if len(unmatched) == len(results):
+            print(f"\nerror: no result has a baseline entry in {args.baseline} "
+                  "(kinds, sizes and backend must match)", file=sys.stderr)
+            return 2
+        if unmatched:
+            print(f"\nwarning: not in {args.baseline}, not compared: {', '.join(unmatched)}", file=sys.stderr)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
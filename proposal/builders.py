@@ -0,0 +1,497 @@
+"""
+Slide builders for SnapAndSend proposal decks.
+
+Each builder adds one slide to the Presentation it is given and returns it.
+`BUILDERS` maps the `kind` of a slide spec onto its builder so decks can be
+described as data (see `proposal.spec`) and rendered with
+`proposal.render.render_slides()`.
+"""
+
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.enum.text import PP_ALIGN
+from pptx.util import Inches, Pt
+
+from .components import COMPONENTS
+from .downsample import MAX_CHART_POINTS, chart_series
+from .textfit import fit_font_size, scaled_size
+from .templates import CONTENT_LAYOUT, SECTION_LAYOUT, TITLE_LAYOUT, get_layout
+from .theme import (
+    ACCENT_COLORS, BLUE, DARK_BLUE, DARK_GRAY, DARK_GREEN, LIGHT_BLUE, LIGHT_GRAY, LIGHT_GREEN, PANEL_GRAY,
+    PRIMARY_GREEN, WHITE,
+)
+from .timeline import timeline_shapes
+from .workbook import WorkbookChartData
+
+
+def add_title_slide(prs, title, subtitle):
+    slide = prs.slides.add_slide(get_layout(prs, TITLE_LAYOUT))
+
+    # Title
+    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(2), Inches(12.333), Inches(1.2))
+    tf = title_box.text_frame
+    p = tf.paragraphs[0]
+    p.text = title
+    p.font.size = Pt(54)
+    p.font.bold = True
+    p.font.color.rgb = WHITE
+    p.alignment = PP_ALIGN.CENTER
+
+    # Subtitle
+    sub_box = slide.shapes.add_textbox(Inches(0.5), Inches(3.5), Inches(12.333), Inches(1))
+    tf = sub_box.text_frame
+    p = tf.paragraphs[0]
+    p.text = subtitle
+    p.font.size = Pt(24)
+    p.font.color.rgb = LIGHT_GREEN
+    p.alignment = PP_ALIGN.CENTER
+
+    return slide
+
+
+def add_section_slide(prs, title):
+    slide = prs.slides.add_slide(get_layout(prs, SECTION_LAYOUT))
+
+    # Title
+    title_box = slide.shapes.add_textbox(Inches(0.8), Inches(3), Inches(11.533), Inches(1.5))
+    tf = title_box.text_frame
+    p = tf.paragraphs[0]
+    p.text = title
+    p.font.size = Pt(44)
+    p.font.bold = True
+    p.font.color.rgb = DARK_GREEN
+    p.alignment = PP_ALIGN.LEFT
+
+    return slide
+
+
+def _draw_header_title(shapes, boxes, texts):
+    title_box = shapes.add_textbox(*boxes[0])
+    tf = title_box.text_frame
+    p = tf.paragraphs[0]
+    p.text = texts[0]
+    p.font.size = Pt(32)
+    p.font.bold = True
+    p.font.color.rgb = WHITE
+
+
+def _add_header_title(slide, title):
+    COMPONENTS.add(slide, _draw_header_title, (), [(Inches(0.5), Inches(0.35), Inches(12.333), Inches(0.7))], [title])
+
+
+def add_content_slide(prs, title, content_items, icon_text=None, font_scale=1.0):
+    """Add a bulleted content slide; `font_scale` shrinks every paragraph (see `proposal.textfit`)."""
+    slide = prs.slides.add_slide(get_layout(prs, CONTENT_LAYOUT))
+
+    # Title
+    _add_header_title(slide, title)
+
+    # Content
+    content_box = slide.shapes.add_textbox(Inches(0.5), Inches(1.6), Inches(12.333), Inches(5.5))
+    tf = content_box.text_frame
+    tf.word_wrap = True
+
+    def size(points):
+        return Pt(scaled_size(points, font_scale))
+
+    for i, item in enumerate(content_items):
+        if i == 0:
+            p = tf.paragraphs[0]
+        else:
+            p = tf.add_paragraph()
+
+        if isinstance(item, dict):
+            p.text = f"• {item['title']}"
+            p.font.size = size(22)
+            p.font.bold = True
+            p.font.color.rgb = DARK_GREEN
+            p.space_after = size(4)
+
+            if 'desc' in item:
+                p2 = tf.add_paragraph()
+                p2.text = f"   {item['desc']}"
+                p2.font.size = size(18)
+                p2.font.color.rgb = LIGHT_GRAY
+                p2.space_after = size(16)
+        else:
+            p.text = f"• {item}"
+            p.font.size = size(20)
+            p.font.color.rgb = DARK_GRAY
+            p.space_after = size(12)
+
+    return slide
+
+
+def _draw_column(shapes, boxes, texts, fill, line, heading_color):
+    panel_box, title_box, content_box = boxes
+    heading, items = texts[1:]
+
+    # Column box
+    panel = shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, *panel_box)
+    panel.fill.solid()
+    panel.fill.fore_color.rgb = fill
+    panel.line.color.rgb = line
+
+    # Column title
+    column_title = shapes.add_textbox(*title_box)
+    tf = column_title.text_frame
+    p = tf.paragraphs[0]
+    p.text = heading
+    p.font.size = Pt(24)
+    p.font.bold = True
+    p.font.color.rgb = heading_color
+    p.alignment = PP_ALIGN.CENTER
+
+    # Column content
+    content = shapes.add_textbox(*content_box)
+    tf = content.text_frame
+    tf.word_wrap = True
+    for i, item in enumerate(items):
+        if i == 0:
+            p = tf.paragraphs[0]
+        else:
+            p = tf.add_paragraph()
+        p.text = item
+        p.font.size = Pt(16)
+        p.font.color.rgb = DARK_GRAY
+        p.space_after = Pt(8)
+
+
+def _add_column(slide, left, heading, items, style):
+    COMPONENTS.add(slide, _draw_column, style, [
+        (left, Inches(1.5), Inches(6), Inches(5.5)),
+        (left + Inches(0.2), Inches(1.7), Inches(5.6), Inches(0.6)),
+        (left + Inches(0.3), Inches(2.4), Inches(5.4), Inches(4.4)),
+    ], [None, heading, [f"• {item}" for item in items]])
+
+
+def add_two_column_slide(prs, title, left_title, left_items, right_title, right_items):
+    slide = prs.slides.add_slide(get_layout(prs, CONTENT_LAYOUT))
+
+    # Title
+    _add_header_title(slide, title)
+
+    _add_column(slide, Inches(0.4), left_title, left_items, (LIGHT_GREEN, PRIMARY_GREEN, DARK_GREEN))
+    _add_column(slide, Inches(6.9), right_title, right_items, (LIGHT_BLUE, BLUE, DARK_BLUE))
+
+    return slide
+
+
+def _draw_step(shapes, boxes, texts, color, title_size, desc_size):
+    card_box, badge_box, number_box, title_box, desc_box = boxes
+    number, title, desc = texts[2:]
+
+    # Step box
+    box = shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, *card_box)
+    box.fill.solid()
+    box.fill.fore_color.rgb = PANEL_GRAY
+    box.line.color.rgb = color
+
+    # Step number
+    num_box = shapes.add_shape(MSO_SHAPE.OVAL, *badge_box)
+    num_box.fill.solid()
+    num_box.fill.fore_color.rgb = color
+    num_box.line.fill.background()
+
+    num_text = shapes.add_textbox(*number_box)
+    tf = num_text.text_frame
+    p = tf.paragraphs[0]
+    p.text = number
+    p.font.size = Pt(20)
+    p.font.bold = True
+    p.font.color.rgb = WHITE
+    p.alignment = PP_ALIGN.CENTER
+
+    # Step title
+    step_title = shapes.add_textbox(*title_box)
+    tf = step_title.text_frame
+    p = tf.paragraphs[0]
+    p.text = title
+    p.font.size = Pt(title_size)
+    p.font.bold = True
+    p.font.color.rgb = DARK_GRAY
+    p.alignment = PP_ALIGN.CENTER
+
+    # Step description
+    step_desc = shapes.add_textbox(*desc_box)
+    tf = step_desc.text_frame
+    tf.word_wrap = True
+    p = tf.paragraphs[0]
+    p.text = desc
+    p.font.size = Pt(desc_size)
+    p.font.color.rgb = LIGHT_GRAY
+    p.alignment = PP_ALIGN.CENTER
+
+
+def _draw_arrow(shapes, boxes, texts):
+    arrow = shapes.add_shape(MSO_SHAPE.RIGHT_ARROW, *boxes[0])
+    arrow.fill.solid()
+    arrow.fill.fore_color.rgb = LIGHT_GRAY
+    arrow.line.fill.background()
+
+
+def add_workflow_slide(prs, title, steps):
+    slide = prs.slides.add_slide(get_layout(prs, CONTENT_LAYOUT))
+
+    # Title
+    _add_header_title(slide, title)
+
+    # Steps
+    step_width = (prs.slide_width - Inches(1)) / len(steps)
+
+    # Shrink step text as steps get narrower; titles only break at explicit newlines
+    text_width = step_width - Inches(0.4)
+    title_size = fit_font_size([step['title'] for step in steps], text_width, Inches(0.6), 16, 9, bold=True, wrap=False)
+    desc_size = fit_font_size([step['desc'] for step in steps], text_width, Inches(2.9), 12, 8)
+
+    for i, step in enumerate(steps):
+        x = Inches(0.5) + (step_width * i)
+        color = ACCENT_COLORS[i % len(ACCENT_COLORS)]
+
+        COMPONENTS.add(slide, _draw_step, (color, title_size, desc_size), [
+            (x + Inches(0.1), Inches(1.8), step_width - Inches(0.2), Inches(4.5)),
+            (x + step_width/2 - Inches(0.3), Inches(2), Inches(0.6), Inches(0.6)),
+            (x + step_width/2 - Inches(0.3), Inches(2.1), Inches(0.6), Inches(0.5)),
+            (x + Inches(0.2), Inches(2.8), step_width - Inches(0.4), Inches(0.6)),
+            (x + Inches(0.2), Inches(3.4), step_width - Inches(0.4), Inches(2.5)),
+        ], [None, None, str(i + 1), step['title'], step['desc']])
+
+        # Arrow between steps
+        if i < len(steps) - 1:
+            COMPONENTS.add(slide, _draw_arrow, (), [(x + step_width - Inches(0.15), Inches(4), Inches(0.3), Inches(0.3))],
+                           [None])
+
+    return slide
+
+
+CHART_TYPES = {
+    "bar": XL_CHART_TYPE.BAR_CLUSTERED,
+    "column": XL_CHART_TYPE.COLUMN_CLUSTERED,
+    "line": XL_CHART_TYPE.LINE,
+    "stacked_bar": XL_CHART_TYPE.BAR_STACKED,
+    "stacked_column": XL_CHART_TYPE.COLUMN_STACKED,
+}
+
+# Beyond this many bars, value labels overlap
+MAX_LABELLED_POINTS = 31
+
+SERIES_COLORS = ACCENT_COLORS
+
+
+def add_chart_slide(prs, title, categories, series, chart_type="column", number_format=None,
+                    max_points=MAX_CHART_POINTS, downsample="auto"):
+    """Add a native chart; `series` maps each series name to one value per category.
+
+    Categories and values may be lists or NumPy arrays. Series longer than
+    `max_points` are cut down with `downsample` (see `proposal.downsample`).
+    """
+    slide = prs.slides.add_slide(get_layout(prs, CONTENT_LAYOUT))
+
+    # Title
+    _add_header_title(slide, title)
+
+    categories, series = chart_series(categories, series, chart_type, max_points, downsample)
+    chart_data = WorkbookChartData(number_format=number_format or "General")
+    chart_data.categories = categories
+    for name, values in series.items():
+        chart_data.add_series(name, values)
+
+    graphic_frame = slide.shapes.add_chart(
+        CHART_TYPES[chart_type], Inches(0.5), Inches(1.5), Inches(12.333), Inches(5.4), chart_data
+    )
+    chart = graphic_frame.chart
+    chart.font.size = Pt(14)
+    chart.font.color.rgb = DARK_GRAY
+    chart.has_legend = len(series) > 1
+    if chart.has_legend:
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+
+    for i, plot_series in enumerate(chart.plots[0].series):
+        color = SERIES_COLORS[i % len(SERIES_COLORS)]
+        if chart_type == "line":
+            plot_series.format.line.color.rgb = color
+            plot_series.smooth = False
+        else:
+            plot_series.format.fill.solid()
+            plot_series.format.fill.fore_color.rgb = color
+
+    if len(series) == 1 and chart_type != "line" and len(categories) <= MAX_LABELLED_POINTS:
+        plot = chart.plots[0]
+        plot.has_data_labels = True
+        plot.data_labels.font.size = Pt(12)
+        plot.data_labels.font.color.rgb = DARK_GRAY
+
+    return slide
+
+
+def add_table_slide(prs, title, columns, rows, column_widths=None):
+    """Add a table with a header row; `column_widths` are relative weights."""
+    slide = prs.slides.add_slide(get_layout(prs, CONTENT_LAYOUT))
+
+    # Title
+    _add_header_title(slide, title)
+
+    width = Inches(12.333)
+    row_height = Inches(0.4)
+    graphic_frame = slide.shapes.add_table(
+        len(rows) + 1, len(columns), Inches(0.5), Inches(1.5), width, row_height * (len(rows) + 1)
+    )
+    table = graphic_frame.table
+
+    weights = column_widths or [1] * len(columns)
+    for col, weight in zip(table.columns, weights):
+        col.width = int(width * weight / sum(weights))
+
+    for c, heading in enumerate(columns):
+        cell = table.cell(0, c)
+        cell.fill.solid()
+        cell.fill.fore_color.rgb = DARK_GREEN
+        p = cell.text_frame.paragraphs[0]
+        p.text = str(heading)
+        p.font.size = Pt(14)
+        p.font.bold = True
+        p.font.color.rgb = WHITE
+
+    for r, row in enumerate(rows, start=1):
+        for c, value in enumerate(row):
+            cell = table.cell(r, c)
+            cell.fill.solid()
+            cell.fill.fore_color.rgb = LIGHT_GREEN if r % 2 else WHITE
+            p = cell.text_frame.paragraphs[0]
+            p.text = str(value)
+            p.font.size = Pt(12)
+            p.font.color.rgb = DARK_GRAY
+
+    return slide
+
+
+def _add_fitted_picture(slide, image, left, top, width, height):
+    """Add `image` scaled to fit the box, centred, at its native aspect ratio."""
+    picture = slide.shapes.add_picture(image, left, top)
+    scale = min(width / picture.width, height / picture.height)
+    picture.width = int(picture.width * scale)
+    picture.height = int(picture.height * scale)
+    picture.left = left + (width - picture.width) // 2
+    picture.top = top + (height - picture.height) // 2
+    return picture
+
+
+def add_image_slide(prs, title, image, caption=None):
+    """Add a picture scaled to fit below the header, with an optional caption."""
+    slide = prs.slides.add_slide(get_layout(prs, CONTENT_LAYOUT))
+
+    # Title
+    _add_header_title(slide, title)
+
+    # Picture, centred in the content area at its native aspect ratio
+    _add_fitted_picture(slide, image, Inches(0.5), Inches(1.4), Inches(12.333), Inches(5.2))
+
+    # Caption
+    if caption:
+        caption_box = slide.shapes.add_textbox(Inches(0.5), Inches(6.65), Inches(11), Inches(0.4))
+        tf = caption_box.text_frame
+        p = tf.paragraphs[0]
+        p.text = caption
+        p.font.size = Pt(12)
+        p.font.color.rgb = LIGHT_GRAY
+        p.alignment = PP_ALIGN.LEFT
+
+    return slide
+
+
+def add_gallery_slide(prs, title, images, columns=None):
+    """Add a grid of captioned pictures; `images` is a list of `{"image", "caption"}`."""
+    slide = prs.slides.add_slide(get_layout(prs, CONTENT_LAYOUT))
+
+    # Title
+    _add_header_title(slide, title)
+
+    if not images:
+        return slide
+    columns = columns or min(len(images), 3)
+    rows = -(-len(images) // columns)
+    cell_width = Inches(12.333) // columns
+    cell_height = Inches(5.5) // rows
+    caption_height = Inches(0.35)
+    gap = Inches(0.1)
+
+    for i, item in enumerate(images):
+        row, column = divmod(i, columns)
+        x = Inches(0.5) + cell_width * column
+        y = Inches(1.4) + cell_height * row
+
+        _add_fitted_picture(
+            slide, item["image"], x + gap, y + gap, cell_width - 2 * gap, cell_height - caption_height - 2 * gap
+        )
+
+        if item.get("caption"):
+            caption_box = slide.shapes.add_textbox(x, y + cell_height - caption_height - gap, cell_width, caption_height)
+            tf = caption_box.text_frame
+            p = tf.paragraphs[0]
+            p.text = item["caption"]
+            p.font.size = Pt(11)
+            p.font.color.rgb = LIGHT_GRAY
+            p.alignment = PP_ALIGN.CENTER
+
+    return slide
+
+
+_TIMELINE_SHAPES = {"rect": MSO_SHAPE.RECTANGLE, "oval": MSO_SHAPE.OVAL}
+
+
+def add_timeline_slide(prs, title, lanes, span_hours=None):
+    """Add swimlanes of status changes over time; see `proposal.timeline.timeline_shapes()`."""
+    slide = prs.slides.add_slide(get_layout(prs, CONTENT_LAYOUT))
+
+    # Title
+    _add_header_title(slide, title)
+
+    for op in timeline_shapes(lanes, span_hours):
+        if op[0] == "text":
+            _, left, top, width, height, text, size, color, align = op
+            box = slide.shapes.add_textbox(left, top, width, height)
+            p = box.text_frame.paragraphs[0]
+            p.text = text
+            p.font.size = Pt(size)
+            p.font.color.rgb = color
+            if align is not None:
+                p.alignment = align
+        else:
+            kind, left, top, width, height, color = op
+            shape = slide.shapes.add_shape(_TIMELINE_SHAPES[kind], left, top, width, height)
+            shape.fill.solid()
+            shape.fill.fore_color.rgb = color
+            shape.line.fill.background()
+
+    return slide
+
+
+BUILDERS = {
+    "title": add_title_slide,
+    "section": add_section_slide,
+    "content": add_content_slide,
+    "two_column": add_two_column_slide,
+    "workflow": add_workflow_slide,
+    "chart": add_chart_slide,
+    "table": add_table_slide,
+    "image": add_image_slide,
+    "gallery": add_gallery_slide,
+    "timeline": add_timeline_slide,
+}
+
+
+# Bump a builder's version whenever its output changes, so cached renders of
+# its slides are invalidated (see `proposal.cache`).
+BUILDER_VERSIONS = {
+    "title": 1,
+    "section": 1,
+    "content": 2,
+    "two_column": 1,
+    "workflow": 2,
+    "chart": 2,
+    "table": 1,
+    "image": 1,
+    "gallery": 1,
+    "timeline": 1,
+}
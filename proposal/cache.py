@@ -0,0 +1,111 @@
+"""
+On-disk cache of rendered slides, keyed by a hash of what produced them.
+
+The key of a slide covers its spec (minus the `id`, which does not affect
+rendering), the version of its builder and the template version. Changing
+one bullet therefore only invalidates that slide; everything else is spliced
+back in from the cached XML without going through the builders again.
+
+Entries are never invalidated in place, only superseded, so the directory
+is kept to `max_bytes`: opening a `SlideCache` deletes the least recently
+used files beyond it, including the heatmap grids and thumbnails expanders
+keep there.
+"""
+
+import hashlib
+import json
+import os
+
+DEFAULT_CACHE_DIR = ".deck-cache"
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+
+def _digest(value):
+    # Specs built in code may carry NumPy arrays (e.g. chart series); they
+    # key by dtype, shape and a hash of their bytes instead of every element
+    if hasattr(value, "tobytes") and hasattr(value, "dtype"):
+        if value.dtype.kind == "O":
+            return value.tolist()
+        return [str(value.dtype), list(value.shape), hashlib.sha256(value.tobytes()).hexdigest()]
+    # In-memory pictures, as expanders make them when caching is off
+    if hasattr(value, "getvalue"):
+        return hashlib.sha256(value.getvalue()).hexdigest()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"can't key a slide spec holding {type(value).__name__}")
+
+
+def slide_key(spec, builder_version, template_version):
+    """Return the hex digest identifying what renders `spec`."""
+    payload = {key: value for key, value in spec.items() if key != "id"}
+    blob = json.dumps(
+        [payload, builder_version, template_version],
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=_digest,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class SlideCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        if max_bytes is not None:
+            self.prune()
+
+    def key(self, spec, builder_version, template_version):
+        return slide_key(spec, builder_version, template_version)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """Return `(layout_name, xml)` stored under `key`, or None."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            # Recently used entries are the last to be pruned
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["layout"], entry["xml"]
+
+    def put(self, key, layout_name, xml):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"layout": layout_name, "xml": xml}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def prune(self):
+        """Delete the least recently used files until the directory holds at most `max_bytes`.
+
+        Returns the number of files deleted.
+        """
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Another process pruned it first
+                continue
+            total -= size
+            removed += 1
+        return removed
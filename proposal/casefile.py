@@ -0,0 +1,140 @@
+"""
+Case files: a short deck per incident, from its report to its resolution.
+
+A case file has up to three slides:
+
+- the report and its community verifications, with the resolution notes;
+- the incident's status changes from `StatusLog` as a timeline, when any
+  were logged;
+- report photos and resolution evidence, when any are stored locally.
+
+`load_cases()` reads any number of incidents in a few bulk queries, one per
+table, so a batch of incidents costs about as much to load as one.
+`proposal.webhooks` renders case files as incidents are resolved.
+"""
+
+from contextlib import closing
+from datetime import datetime, timezone
+
+from .datasource import connect, epoch_ms
+from .evidence import UPLOADS_DIR, gallery_slides
+from .timeline import timeline_slides
+
+# Bounded IN lists keep within SQLite's host-parameter limit
+_BATCH = 500
+DESCRIPTION_CHARS = 240
+PHOTOS_PER_SLIDE = 6
+
+
+def _in(column, ids):
+    return f"{column} IN ({', '.join('?' * len(ids))})"
+
+
+def load_cases(path=None, report_ids=()):
+    """Return `{report id: case}` for those of `report_ids` that exist.
+
+    A case is the report's columns plus `verifications` (count, nearest and
+    mean distance in metres, first and last time), `history` (`StatusLog`
+    rows as `(new_status, changed_by, at_ms)`) and `images` (photo URLs).
+    """
+    ids = list(dict.fromkeys(report_ids))
+    cases = {}
+    with closing(connect(path)) as conn:
+        for start in range(0, len(ids), _BATCH):
+            batch = ids[start:start + _BATCH]
+            for (id_, title, description, category, status, address, latitude, longitude, created, resolved,
+                 notes, evidence) in conn.execute(
+                f"SELECT id, title, description, category, status, address, latitude, longitude, "
+                f"{epoch_ms('createdAt')}, {epoch_ms('resolvedAt')}, resolutionNotes, resolutionEvidence "
+                f"FROM Report WHERE {_in('id', batch)}",
+                batch,
+            ):
+                cases[id_] = {
+                    "id": id_, "title": title, "description": description, "category": category,
+                    "status": status, "address": address, "latitude": latitude, "longitude": longitude,
+                    "created": created, "resolved": resolved, "notes": notes, "evidence": evidence,
+                    "verifications": None, "history": [], "images": [],
+                }
+            for report_id, count, nearest, mean, first, last in conn.execute(
+                f"SELECT reportId, COUNT(*), MIN(distance), AVG(distance), "
+                f"MIN({epoch_ms('createdAt')}), MAX({epoch_ms('createdAt')}) "
+                f"FROM Agreement WHERE {_in('reportId', batch)} GROUP BY reportId",
+                batch,
+            ):
+                cases[report_id]["verifications"] = {
+                    "count": count, "nearest": nearest, "mean": mean, "first": first, "last": last,
+                }
+            for report_id, new_status, changed_by, at in conn.execute(
+                f"SELECT reportId, newStatus, changedBy, {epoch_ms('createdAt')} "
+                f"FROM StatusLog WHERE {_in('reportId', batch)} ORDER BY reportId, {epoch_ms('createdAt')}",
+                batch,
+            ):
+                cases[report_id]["history"].append((new_status, changed_by, at))
+            for report_id, url in conn.execute(
+                f"SELECT reportId, imageUrl FROM Image WHERE {_in('reportId', batch)} ORDER BY createdAt",
+                batch,
+            ):
+                cases[report_id]["images"].append(url)
+    return cases
+
+
+def _time(ms):
+    if ms is None:
+        return "–"
+    return datetime.fromtimestamp(ms / 1000, timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+
+
+def _shorten(text, limit=DESCRIPTION_CHARS):
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def case_file_slides(case, uploads_dir=UPLOADS_DIR, **thumbnail_options):
+    """Return the one to three slide specs of the case file for `case` (see `load_cases()`)."""
+    location = case["address"] or f"{case['latitude']:.5f}, {case['longitude']:.5f}"
+    report = [
+        f"Category: {case['category']}",
+        f"Status: {case['status']}",
+        f"Reported: {_time(case['created'])}",
+        f"Location: {location}",
+    ]
+    if case["description"]:
+        report.append(_shorten(case["description"]))
+
+    verifications = case["verifications"]
+    if verifications:
+        outcome = [
+            f"{verifications['count']} community verification{'s' if verifications['count'] != 1 else ''}",
+            f"Nearest {verifications['nearest']:.0f} m away, {verifications['mean']:.0f} m on average",
+            f"First {_time(verifications['first'])}, last {_time(verifications['last'])}",
+        ]
+    else:
+        outcome = ["No community verifications"]
+    if case["resolved"] is not None:
+        outcome.append(f"Resolved: {_time(case['resolved'])}")
+    if case["notes"]:
+        outcome.append(f"Notes: {_shorten(case['notes'])}")
+
+    slides = [{
+        "kind": "two_column",
+        "title": f"Case File: {_shorten(case['title'], 60)}",
+        "left_title": "Report",
+        "left_items": report,
+        "right_title": "Verifications & Resolution",
+        "right_items": outcome,
+    }]
+
+    if case["history"]:
+        timeline = next(timeline_slides(
+            [(case["id"], case["category"], case["created"], case["history"])], lanes_per_slide=1
+        ))
+        timeline["title"] = "Resolution Timeline"
+        slides.append(timeline)
+
+    if case["images"] or case["evidence"]:
+        # One page of photos, keeping room for the resolution evidence
+        shown = dict(case, images=case["images"][:PHOTOS_PER_SLIDE - bool(case["evidence"])])
+        slides += gallery_slides(
+            [shown], "Photos & Evidence", PHOTOS_PER_SLIDE, uploads_dir, **thumbnail_options
+        )[:1]
+    return slides
@@ -0,0 +1,154 @@
+"""
+Command-line interface for the proposal deck generator.
+
+    python -m proposal [--spec FILE] [--out FILE|-] [--list-slides] [--dry-run]
+                       [--compression {deflated,stored}] [--compress-level N] [--deterministic]
+                       [--backend {pptx,compiled}] [--profile TRACE.json]
+                       [--shard-slides N] [--shard-mb M] [--locales LIST|all [--fork]] [--watch]
+
+Only the standard library is imported until a deck is rendered, so `--help`,
+`--list-slides` and `--dry-run` return in a few tens of milliseconds.
+"""
+
+import argparse
+import sys
+import time
+
+from .cache import DEFAULT_CACHE_DIR
+from .spec import DEFAULT_SPEC_PATH, load_spec, validate_spec
+
+
+def _slide_label(slide):
+    title = slide.get("title", "")
+    return " / ".join(line for line in str(title).splitlines() if line)
+
+
+def _list_slides(spec, out):
+    for index, slide in enumerate(spec["slides"], start=1):
+        print(f"{index:3d}  {slide.get('id', '-'):<28} {slide['kind']:<11} {_slide_label(slide)}", file=out)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="snapandsend-proposal",
+        description="Generate the SnapAndSend & Incident Response proposal deck.",
+    )
+    parser.add_argument("--spec", default=DEFAULT_SPEC_PATH, help="deck spec (.json, .toml, .yaml); default: the standard proposal")
+    parser.add_argument("--out", default="SnapAndSend_Proposal.pptx", help="output .pptx path, or - for stdout (default: %(default)s)")
+    parser.add_argument("--list-slides", action="store_true", help="list the slides in the spec and exit")
+    parser.add_argument("--dry-run", action="store_true", help="validate the spec and exit without rendering")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="slide cache directory (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="render every slide from scratch")
+    parser.add_argument("--compression", choices=("deflated", "stored"), default="deflated",
+                        help="ZIP compression; stored is fastest for intermediate artifacts (default: %(default)s)")
+    parser.add_argument("--compress-level", type=int, choices=range(10), metavar="0-9", default=None,
+                        help="deflate level (default: zlib's)")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="fixed timestamps and part order, so identical specs give identical bytes")
+    parser.add_argument("--backend", choices=("pptx", "compiled"), default="pptx",
+                        help="compiled builds text and shape slides from XML templates, much faster (default: %(default)s)")
+    parser.add_argument("--profile", metavar="TRACE.json",
+                        help="record per-slide and save timings as a Chrome trace and print a summary")
+    parser.add_argument("--shard-slides", type=int, metavar="N",
+                        help="split the deck into files of at most N slides, with OUT an index linking them")
+    parser.add_argument("--shard-mb", type=float, metavar="M",
+                        help="split the deck into files of at most M MB, with OUT an index linking them")
+    parser.add_argument("--locales", metavar="LIST",
+                        help="comma-separated locales (or all) to render, each to OUT with the locale before the extension")
+    parser.add_argument("--fork", action="store_true",
+                        help="with --locales, render each extra locale in a child forked from the warm parent")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and rebuild the changed slides whenever the spec or its inputs change")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    try:
+        spec = validate_spec(load_spec(args.spec))
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if args.list_slides:
+        _list_slides(spec, sys.stdout)
+        return 0
+    if args.dry_run:
+        print(f"{args.spec}: {len(spec['slides'])} slides OK", file=sys.stderr)
+        return 0
+
+    sharded = args.shard_slides is not None or args.shard_mb is not None
+    if sharded and args.out == "-":
+        print("error: sharded decks can't be written to stdout", file=sys.stderr)
+        return 2
+    if args.locales and (sharded or args.profile or args.out == "-"):
+        print("error: --locales writes one file per locale and can't be combined with sharding, --profile or stdout",
+              file=sys.stderr)
+        return 2
+    if args.watch and (sharded or args.locales or args.profile or args.out == "-"):
+        print("error: --watch rewrites one file and can't be combined with sharding, --locales, --profile or stdout",
+              file=sys.stderr)
+        return 2
+
+    from . import build_deck
+
+    profiler = None
+    if args.profile:
+        from .profiling import Profiler
+        profiler = Profiler()
+
+    start = time.perf_counter()
+    options = dict(
+        compression=args.compression,
+        compress_level=args.compress_level,
+        deterministic=args.deterministic,
+        profiler=profiler,
+        backend=args.backend,
+    )
+    cache_dir = None if args.no_cache else args.cache_dir
+    if args.watch:
+        from .cache import SlideCache
+        from .watch import watch
+
+        options.pop("profiler")
+        watch(args.spec, args.out, cache=SlideCache(cache_dir) if cache_dir else None, **options)
+        return 0
+    if args.locales:
+        from .i18n import available_locales, build_locales
+
+        options.pop("profiler")
+        locales = available_locales() if args.locales == "all" else args.locales.split(",")
+        try:
+            results = build_locales(spec, args.out, locales, cache_dir=cache_dir, fork=args.fork, **options)
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+        for locale, path, seconds in results:
+            print(f"  {locale}: {path} ({seconds:.2f}s)", file=sys.stderr)
+        print(f"{len(results)} locales saved ({time.perf_counter() - start:.2f}s)", file=sys.stderr)
+    elif sharded:
+        from .cache import SlideCache
+        from .shard import build_sharded
+
+        shards = build_sharded(
+            spec["slides"], args.out,
+            max_slides=args.shard_slides,
+            max_bytes=None if args.shard_mb is None else int(args.shard_mb * 1e6),
+            cache=SlideCache(cache_dir) if cache_dir else None,
+            **options,
+        )
+        for shard in shards:
+            print(f"  {shard['path']}: slides {shard['first']}-{shard['last']}, {shard['bytes']:,} bytes",
+                  file=sys.stderr)
+        print(f"Index saved to: {args.out} ({len(shards)} shards, {time.perf_counter() - start:.2f}s)",
+              file=sys.stderr)
+    else:
+        build_deck(spec, args.out, cache_dir=cache_dir, **options)
+        destination = "stdout" if args.out == "-" else args.out
+        print(f"Presentation saved to: {destination} ({time.perf_counter() - start:.2f}s)", file=sys.stderr)
+
+    if profiler is not None:
+        profiler.write_chrome_trace(args.profile)
+        print(f"\n{profiler.summary()}\n\nTrace written to: {args.profile}", file=sys.stderr)
+    return 0
@@ -0,0 +1,390 @@
+"""
+Compiled slide backend: slide XML assembled from string templates.
+
+The builders in `proposal.builders` set every font, fill and line property
+through python-pptx proxies, each one a walk over and mutation of the lxml
+tree. For the text, shape and table kinds that XML is fixed apart from the text,
+the sizes and the geometry, so here it is kept as string templates, filled
+in per slide and parsed once. `COMPILERS` maps those kinds onto functions
+taking the same arguments as the builders and returning `(layout_name, xml)`
+with the slide's `p:cSld` XML, the same entries `proposal.cache` stores.
+
+The XML is the same the builders produce, shape ids and names included, so
+the two backends give identical slides. Kinds without a compiler (charts,
+pictures) always go through their builder.
+"""
+
+import re
+import zlib
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from pptx.enum.text import PP_ALIGN
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.package import Part
+from pptx.opc.packuri import PackURI
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.oxml.slide import CT_Slide
+from pptx.parts.slide import SlidePart
+from pptx.util import Inches, Pt
+
+from .templates import CONTENT_LAYOUT, SECTION_LAYOUT, SLIDE_WIDTH, TITLE_LAYOUT
+from .textfit import fit_font_size, scaled_size
+from .theme import (
+    ACCENT_COLORS, BLUE, DARK_BLUE, DARK_GRAY, DARK_GREEN, LIGHT_BLUE, LIGHT_GRAY, LIGHT_GREEN, PANEL_GRAY,
+    PRIMARY_GREEN, WHITE,
+)
+from .timeline import timeline_shapes
+
+_ALIGN = {PP_ALIGN.LEFT: "l", PP_ALIGN.CENTER: "ctr", PP_ALIGN.RIGHT: "r"}
+
+_CSLD = (
+    f'<p:cSld {nsdecls("p", "a", "r")}><p:spTree>'
+    '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr><p:grpSpPr/>'
+    "{shapes}</p:spTree></p:cSld>"
+)
+
+_XFRM = '<a:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+
+_TEXTBOX = (
+    '<p:sp><p:nvSpPr><p:cNvPr id="{id}" name="TextBox {n}"/><p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>'
+    '<p:spPr>{xfrm}<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/></p:spPr>'
+    '<p:txBody><a:bodyPr wrap="{wrap}"><a:spAutoFit/></a:bodyPr><a:lstStyle/>{paragraphs}</p:txBody></p:sp>'
+)
+
+_AUTOSHAPE = (
+    '<p:sp><p:nvSpPr><p:cNvPr id="{id}" name="{name} {n}"/><p:cNvSpPr/><p:nvPr/></p:nvSpPr>'
+    '<p:spPr>{xfrm}<a:prstGeom prst="{prst}"><a:avLst/></a:prstGeom>'
+    '<a:solidFill><a:srgbClr val="{fill}"/></a:solidFill>{line}</p:spPr>'
+    '<p:style><a:lnRef idx="1"><a:schemeClr val="accent1"/></a:lnRef>'
+    '<a:fillRef idx="3"><a:schemeClr val="accent1"/></a:fillRef>'
+    '<a:effectRef idx="2"><a:schemeClr val="accent1"/></a:effectRef>'
+    '<a:fontRef idx="minor"><a:schemeClr val="lt1"/></a:fontRef></p:style>'
+    '<p:txBody><a:bodyPr rtlCol="0" anchor="ctr"/><a:lstStyle/><a:p><a:pPr algn="ctr"/></a:p></p:txBody></p:sp>'
+)
+
+_TABLE = (
+    '<p:graphicFrame><p:nvGraphicFramePr><p:cNvPr id="{id}" name="Table {n}"/>'
+    '<p:cNvGraphicFramePr><a:graphicFrameLocks noGrp="1"/></p:cNvGraphicFramePr><p:nvPr/></p:nvGraphicFramePr>'
+    '<p:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></p:xfrm>'
+    '<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/table"><a:tbl>'
+    '<a:tblPr firstRow="1" bandRow="1"><a:tableStyleId>{{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}}</a:tableStyleId></a:tblPr>'
+    '<a:tblGrid>{grid}</a:tblGrid>{rows}</a:tbl></a:graphicData></a:graphic></p:graphicFrame>'
+)
+
+_CELL_START = "<a:tc><a:txBody><a:bodyPr/><a:lstStyle/>"
+_CELL_END = '</a:txBody><a:tcPr><a:solidFill><a:srgbClr val="{fill}"/></a:solidFill></a:tcPr></a:tc>'
+
+# (name, prst) of the MSO_SHAPE autoshapes the builders use
+_ROUNDED_RECTANGLE = ("Rounded Rectangle", "roundRect")
+_OVAL = ("Oval", "ellipse")
+_RECTANGLE = ("Rectangle", "rect")
+_RIGHT_ARROW = ("Right Arrow", "rightArrow")
+
+_NO_LINE = "<a:ln><a:noFill/></a:ln>"
+
+
+# Characters _Paragraph.text doesn't write verbatim: line breaks and control characters
+_SPECIAL = re.compile(r"[\x00-\x1F]")
+
+
+def _run_text(text):
+    # As python-pptx's _Run.text: control characters other than tab and
+    # newline are written as _xHHHH_ escapes
+    text = re.sub(r"([\x00-\x08\x0B-\x1F])", lambda match: "_x%04X_" % ord(match.group(1)), text)
+    return escape(text)
+
+
+@lru_cache(maxsize=256)
+def _paragraph_start(size, color, bold, align, space_after):
+    algn = f' algn="{_ALIGN[align]}"' if align is not None else ""
+    spacing = f'<a:spcAft><a:spcPts val="{Pt(space_after).centipoints}"/></a:spcAft>' if space_after is not None else ""
+    weight = ' b="1"' if bold else ""
+    return (
+        f'<a:p><a:pPr{algn}>{spacing}<a:defRPr sz="{Pt(size).centipoints}"{weight}>'
+        f'<a:solidFill><a:srgbClr val="{color}"/></a:solidFill></a:defRPr></a:pPr>'
+    )
+
+
+def _paragraph(text, size, color, bold=False, align=None, space_after=None):
+    """Return the `a:p` XML python-pptx writes for `p.text = text` plus the given formatting."""
+    return _paragraph_text(_paragraph_start(size, str(color), bold, align, space_after), text)
+
+
+def _paragraph_text(start, text):
+    if not text:
+        return f"{start}</a:p>"
+    if _SPECIAL.search(text) is None:
+        return f"{start}<a:r><a:t>{escape(text)}</a:t></a:r></a:p>"
+    runs = []
+    # Newlines and vertical tabs become line breaks between runs, as in _Paragraph.text
+    for i, line in enumerate(re.split("\n|\v", text)):
+        if i:
+            runs.append("<a:br/>")
+        if line:
+            runs.append(f"<a:r><a:t>{_run_text(line)}</a:t></a:r>")
+    return f"{start}{''.join(runs)}</a:p>"
+
+
+def _xfrm(left, top, width, height):
+    # %d-formatted like python-pptx, which truncates fractional EMU
+    return _XFRM.format(x=int(left), y=int(top), cx=int(width), cy=int(height))
+
+
+class _ShapeTree:
+    """Accumulates shape XML, numbering shapes the way python-pptx does."""
+
+    def __init__(self):
+        self._shapes = []
+
+    def _next_id(self):
+        # id 1 is the group shape of the tree itself
+        return len(self._shapes) + 2
+
+    def add_textbox(self, left, top, width, height, paragraphs, word_wrap=False):
+        shape_id = self._next_id()
+        self._shapes.append(_TEXTBOX.format(
+            id=shape_id, n=shape_id - 1, xfrm=_xfrm(left, top, width, height),
+            wrap="square" if word_wrap else "none", paragraphs="".join(paragraphs) or "<a:p/>",
+        ))
+
+    def add_shape(self, autoshape, left, top, width, height, fill, line=None):
+        """Add a solid-filled autoshape outlined in `line`, or without an outline if None."""
+        name, prst = autoshape
+        shape_id = self._next_id()
+        self._shapes.append(_AUTOSHAPE.format(
+            id=shape_id, n=shape_id - 1, name=name, prst=prst, xfrm=_xfrm(left, top, width, height), fill=fill,
+            line=_NO_LINE if line is None else f'<a:ln><a:solidFill><a:srgbClr val="{line}"/></a:solidFill></a:ln>',
+        ))
+
+    def add_table(self, left, top, column_widths, row_height, rows):
+        """Add a table; `rows` yields `(fill, paragraphs)` per row, one paragraph per cell."""
+        shape_id = self._next_id()
+        grid = "".join(f'<a:gridCol w="{width}"/>' for width in column_widths)
+        row_start = f'<a:tr h="{row_height}">'
+        row_xml = []
+        for fill, paragraphs in rows:
+            cell_end = _CELL_END.format(fill=fill)
+            row_xml.append(f"{row_start}{_CELL_START}{(cell_end + _CELL_START).join(paragraphs)}{cell_end}</a:tr>")
+        self._shapes.append(_TABLE.format(
+            id=shape_id, n=shape_id - 1, x=int(left), y=int(top),
+            cx=sum(column_widths), cy=row_height * len(row_xml), grid=grid, rows="".join(row_xml),
+        ))
+
+    def xml(self):
+        return _CSLD.format(shapes="".join(self._shapes))
+
+
+def _add_header_title(shapes, title):
+    shapes.add_textbox(Inches(0.5), Inches(0.35), Inches(12.333), Inches(0.7),
+                       [_paragraph(title, 32, WHITE, bold=True)])
+
+
+def compile_title_slide(title, subtitle):
+    shapes = _ShapeTree()
+    shapes.add_textbox(Inches(0.5), Inches(2), Inches(12.333), Inches(1.2),
+                       [_paragraph(title, 54, WHITE, bold=True, align=PP_ALIGN.CENTER)])
+    shapes.add_textbox(Inches(0.5), Inches(3.5), Inches(12.333), Inches(1),
+                       [_paragraph(subtitle, 24, LIGHT_GREEN, align=PP_ALIGN.CENTER)])
+    return TITLE_LAYOUT, shapes.xml()
+
+
+def compile_section_slide(title):
+    shapes = _ShapeTree()
+    shapes.add_textbox(Inches(0.8), Inches(3), Inches(11.533), Inches(1.5),
+                       [_paragraph(title, 44, DARK_GREEN, bold=True, align=PP_ALIGN.LEFT)])
+    return SECTION_LAYOUT, shapes.xml()
+
+
+def compile_content_slide(title, content_items, icon_text=None, font_scale=1.0):
+    shapes = _ShapeTree()
+    _add_header_title(shapes, title)
+
+    def size(points):
+        return scaled_size(points, font_scale)
+
+    paragraphs = []
+    for item in content_items:
+        if isinstance(item, dict):
+            paragraphs.append(_paragraph(f"• {item['title']}", size(22), DARK_GREEN, bold=True,
+                                         space_after=size(4)))
+            if 'desc' in item:
+                paragraphs.append(_paragraph(f"   {item['desc']}", size(18), LIGHT_GRAY, space_after=size(16)))
+        else:
+            paragraphs.append(_paragraph(f"• {item}", size(20), DARK_GRAY, space_after=size(12)))
+    shapes.add_textbox(Inches(0.5), Inches(1.6), Inches(12.333), Inches(5.5), paragraphs, word_wrap=True)
+    return CONTENT_LAYOUT, shapes.xml()
+
+
+def _bullets(items):
+    return [_paragraph(f"• {item}", 16, DARK_GRAY, space_after=8) for item in items]
+
+
+def compile_two_column_slide(title, left_title, left_items, right_title, right_items):
+    shapes = _ShapeTree()
+    _add_header_title(shapes, title)
+
+    shapes.add_shape(_ROUNDED_RECTANGLE, Inches(0.4), Inches(1.5), Inches(6), Inches(5.5), LIGHT_GREEN, PRIMARY_GREEN)
+    shapes.add_textbox(Inches(0.6), Inches(1.7), Inches(5.6), Inches(0.6),
+                       [_paragraph(left_title, 24, DARK_GREEN, bold=True, align=PP_ALIGN.CENTER)])
+    shapes.add_textbox(Inches(0.7), Inches(2.4), Inches(5.4), Inches(4.4), _bullets(left_items), word_wrap=True)
+
+    shapes.add_shape(_ROUNDED_RECTANGLE, Inches(6.9), Inches(1.5), Inches(6), Inches(5.5), LIGHT_BLUE, BLUE)
+    shapes.add_textbox(Inches(7.1), Inches(1.7), Inches(5.6), Inches(0.6),
+                       [_paragraph(right_title, 24, DARK_BLUE, bold=True, align=PP_ALIGN.CENTER)])
+    shapes.add_textbox(Inches(7.2), Inches(2.4), Inches(5.4), Inches(4.4), _bullets(right_items), word_wrap=True)
+    return CONTENT_LAYOUT, shapes.xml()
+
+
+def compile_workflow_slide(title, steps):
+    shapes = _ShapeTree()
+    _add_header_title(shapes, title)
+
+    # Same arithmetic as add_workflow_slide(), fractional EMU included
+    step_width = (SLIDE_WIDTH - Inches(1)) / len(steps)
+    text_width = step_width - Inches(0.4)
+    title_size = fit_font_size([step['title'] for step in steps], text_width, Inches(0.6), 16, 9, bold=True, wrap=False)
+    desc_size = fit_font_size([step['desc'] for step in steps], text_width, Inches(2.9), 12, 8)
+
+    for i, step in enumerate(steps):
+        x = Inches(0.5) + (step_width * i)
+        color = ACCENT_COLORS[i % len(ACCENT_COLORS)]
+
+        shapes.add_shape(_ROUNDED_RECTANGLE, x + Inches(0.1), Inches(1.8), step_width - Inches(0.2), Inches(4.5),
+                         PANEL_GRAY, color)
+        shapes.add_shape(_OVAL, x + step_width/2 - Inches(0.3), Inches(2), Inches(0.6), Inches(0.6), color)
+        shapes.add_textbox(x + step_width/2 - Inches(0.3), Inches(2.1), Inches(0.6), Inches(0.5),
+                           [_paragraph(str(i + 1), 20, WHITE, bold=True, align=PP_ALIGN.CENTER)])
+        shapes.add_textbox(x + Inches(0.2), Inches(2.8), step_width - Inches(0.4), Inches(0.6),
+                           [_paragraph(step['title'], title_size, DARK_GRAY, bold=True, align=PP_ALIGN.CENTER)])
+        shapes.add_textbox(x + Inches(0.2), Inches(3.4), step_width - Inches(0.4), Inches(2.5),
+                           [_paragraph(step['desc'], desc_size, LIGHT_GRAY, align=PP_ALIGN.CENTER)], word_wrap=True)
+
+        if i < len(steps) - 1:
+            shapes.add_shape(_RIGHT_ARROW, x + step_width - Inches(0.15), Inches(4), Inches(0.3), Inches(0.3),
+                             LIGHT_GRAY)
+    return CONTENT_LAYOUT, shapes.xml()
+
+
+def _table_rows(columns, rows):
+    yield DARK_GREEN, [_paragraph(str(heading), 14, WHITE, bold=True) for heading in columns]
+    start = _paragraph_start(12, str(DARK_GRAY), False, None, None)
+    odd, even = str(LIGHT_GREEN), str(WHITE)
+    for r, row in enumerate(rows, start=1):
+        yield odd if r % 2 else even, [_paragraph_text(start, str(value)) for value in row]
+
+
+def compile_table_slide(title, columns, rows, column_widths=None):
+    shapes = _ShapeTree()
+    _add_header_title(shapes, title)
+
+    width = Inches(12.333)
+    weights = column_widths or [1] * len(columns)
+    widths = [int(width * weight / sum(weights)) for weight in weights]
+    shapes.add_table(Inches(0.5), Inches(1.5), widths, Inches(0.4), _table_rows(columns, rows))
+    return CONTENT_LAYOUT, shapes.xml()
+
+
+_TIMELINE_SHAPES = {"rect": _RECTANGLE, "oval": _OVAL}
+
+
+def compile_timeline_slide(title, lanes, span_hours=None):
+    shapes = _ShapeTree()
+    _add_header_title(shapes, title)
+
+    for op in timeline_shapes(lanes, span_hours):
+        if op[0] == "text":
+            _, left, top, width, height, text, size, color, align = op
+            shapes.add_textbox(left, top, width, height, [_paragraph(text, size, color, align=align)])
+        else:
+            kind, left, top, width, height, color = op
+            shapes.add_shape(_TIMELINE_SHAPES[kind], left, top, width, height, str(color))
+    return CONTENT_LAYOUT, shapes.xml()
+
+
+COMPILERS = {
+    "title": compile_title_slide,
+    "section": compile_section_slide,
+    "content": compile_content_slide,
+    "two_column": compile_two_column_slide,
+    "workflow": compile_workflow_slide,
+    "table": compile_table_slide,
+    "timeline": compile_timeline_slide,
+}
+
+
+_SLD_START = (
+    "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
+    f'<p:sld {nsdecls("a", "p", "r")}><p:cSld>'
+)
+_SLD_END = "<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>"
+_CSLD_START = f'<p:cSld {nsdecls("p", "a", "r")}>'
+
+
+class PackedSlidePart(SlidePart):
+    """Slide part held as compressed serialized XML until its tree is needed.
+
+    An lxml tree costs around ten times the size of its XML, which adds up
+    over thousands of slides. The tree is parsed on first access to
+    `_element` (anything going through the object model) and kept from then
+    on; saving an untouched slide writes the stored XML without parsing it.
+    """
+
+    def __init__(self, partname, package, blob):
+        Part.__init__(self, partname, CT.PML_SLIDE, package)
+        self._packed = zlib.compress(blob, 1)
+        self._tree = None
+
+    @property
+    def _element(self):
+        if self._tree is None:
+            self._tree = parse_xml(zlib.decompress(self._packed))
+            self._packed = None
+        return self._tree
+
+    @property
+    def blob(self):
+        if self._tree is None:
+            return zlib.decompress(self._packed)
+        return serialize_part_xml(self._tree)
+
+
+def add_slide(prs, layout, xml):
+    """Append a slide on `layout` whose content is the `p:cSld` XML string `xml`; return its part.
+
+    Equivalent to `prs.slides.add_slide(layout)` followed by replacing the
+    slide's `p:cSld`, minus the cost of python-pptx relating the new part:
+    that scans every existing relationship of the presentation and every
+    slide id, which makes adding n slides O(n^2). A new part can't be
+    related yet, and slides are only ever appended, so the next partname
+    and id follow the last slide's (even counting the slide list is O(n) in
+    lxml). Template layouts carry no placeholders to clone.
+
+    XML in the form this module and `proposal.cache` write is stored as a
+    `PackedSlidePart` without being parsed; `part.slide` parses it when
+    first used.
+    """
+    sld_id_lst = prs.slides._sldIdLst
+    try:
+        last = sld_id_lst[-1]
+    except IndexError:
+        number, next_id = 1, 256
+    else:
+        # prs.slides renumbers slide parts in order, so partnames track positions
+        number = prs.part.related_part(last.rId).partname.idx + 1
+        next_id = max(int(last.get("id")) + 1, 256)
+
+    partname = PackURI("/ppt/slides/slide%d.xml" % number)
+    if xml.startswith(_CSLD_START):
+        blob = f"{_SLD_START}{xml[len(_CSLD_START):]}{_SLD_END}".encode("utf-8")
+        slide_part = PackedSlidePart(partname, prs.part.package, blob)
+    else:
+        element = CT_Slide.new()
+        element.replace(element.cSld, parse_xml(xml))
+        slide_part = SlidePart(partname, CT.PML_SLIDE, prs.part.package, element)
+    slide_part.relate_to(layout.part, RT.SLIDE_LAYOUT)
+    rId = prs.part.rels._add_relationship(RT.SLIDE, slide_part)
+    sld_id_lst._add_sldId(id=next_id, rId=rId)
+    return slide_part
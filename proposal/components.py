@@ -0,0 +1,113 @@
+"""
+Component cache: repeated shape groups drawn once and stamped as copies.
+
+Workflow steps and two-column panels are the same few shapes over and
+over: a step card is a rounded rectangle, a numbered badge and two text
+boxes; a column panel is a rounded rectangle, a heading and a bullet list.
+Drawing each one through python-pptx sets every fill, line and font through
+a proxy, which costs far more than the XML it ends up with.
+`ComponentCache.add()` draws a component once per style (its colours and
+font sizes), keeps the shape elements, and adds every later instance as a
+deep copy of them with only the shape ids, geometry and text replaced.
+Those are the elements python-pptx would have built, so slides come out
+the same either way.
+"""
+
+import copy
+import re
+
+from pptx.oxml.slide import CT_Slide
+from pptx.shapes.shapetree import SlideShapes
+
+_NUMBERED_NAME = re.compile(r"^(.*) \d+$")
+
+# Components kept per cache; styles vary with a deck's font sizes only
+MAX_COMPONENTS = 256
+
+
+class ComponentCache:
+    """Shape groups kept as XML, keyed by the function drawing them and their style.
+
+    A drawing function is called as `draw(shapes, boxes, texts, *style)` and
+    adds one shape per box to the python-pptx `shapes`, in order. `boxes`
+    are `(left, top, width, height)`; `texts` holds, per box, None for a
+    shape without text, a string for one paragraph, or a list of strings
+    for one paragraph each, all formatted like the first. Everything else
+    about the shapes must follow from `style`.
+    """
+
+    def __init__(self, maxsize=MAX_COMPONENTS):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._components = {}
+
+    def add(self, slide, draw, style, boxes, texts):
+        """Add the component `draw` draws in `style` to `slide`, at `boxes` with `texts`."""
+        key = (draw, style)
+        component = self._components.get(key)
+        if component is None:
+            self.misses += 1
+            component = self._draw(draw, style, boxes, texts)
+            if len(self._components) >= self.maxsize:
+                self._components.clear()
+            self._components[key] = component
+        else:
+            self.hits += 1
+
+        sp_tree = slide.shapes._spTree
+        shape_id = sp_tree.max_shape_id
+        for (element, basename, paragraph), box, text in zip(component, boxes, texts):
+            shape_id += 1
+            element = copy.deepcopy(element)
+            c_nv_pr = element[0][0]
+            c_nv_pr.set("id", str(shape_id))
+            c_nv_pr.set("name", f"{basename} {shape_id - 1}")
+            # As python-pptx writes them: fractional EMUs truncated
+            xfrm = element.spPr.xfrm
+            left, top, width, height = box
+            xfrm.off.set("x", "%d" % left)
+            xfrm.off.set("y", "%d" % top)
+            xfrm.ext.set("cx", "%d" % width)
+            xfrm.ext.set("cy", "%d" % height)
+            if paragraph is not None:
+                _set_text(element.txBody, paragraph, text)
+            sp_tree.insert_element_before(element, "p:extLst")
+
+    def _draw(self, draw, style, boxes, texts):
+        # Draw on a scratch shape tree; an empty list still draws one
+        # paragraph, kept as the format of the list's paragraphs
+        sp_tree = CT_Slide.new().cSld.spTree
+        draw(SlideShapes(sp_tree, None), boxes, [[""] if text == [] else text for text in texts], *style)
+        elements = list(sp_tree.iter_shape_elms())
+        if len(elements) != len(boxes):
+            raise ValueError(f"{draw.__name__} drew {len(elements)} shapes for {len(boxes)} boxes")
+
+        component = []
+        for element, text in zip(elements, texts):
+            basename = _NUMBERED_NAME.match(element[0][0].get("name")).group(1)
+            paragraph = None
+            if text is not None:
+                paragraphs = element.txBody.p_lst
+                paragraph = paragraphs[0]
+                for p in paragraphs:
+                    element.txBody.remove(p)
+                for child in paragraph.content_children:
+                    paragraph.remove(child)
+            component.append((element, basename, paragraph))
+        return component
+
+
+def _set_text(tx_body, paragraph, text):
+    lines = [text] if isinstance(text, str) else text
+    if not lines:
+        # As an empty text frame: one bare paragraph
+        tx_body.add_p()
+    for line in lines:
+        p = copy.deepcopy(paragraph)
+        p.append_text(line)
+        tx_body.append(p)
+
+
+# Shared by the builders, like the layouts of a Presentation
+COMPONENTS = ComponentCache()
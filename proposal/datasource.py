@@ -0,0 +1,295 @@
+"""
+Live statistics read from the SnapAndSend database.
+
+Reads the Prisma `Report`, `Agreement` and `StatusLog` tables of the SQLite
+database in a handful of bulk queries: counts are grouped in SQL, and the
+per-report timestamps needed for response-time percentiles are pulled into
+NumPy arrays in one pass rather than walked row by row in Python.
+
+Prisma stores SQLite DateTime columns as Unix milliseconds; ISO-8601 text
+values (e.g. rows written by other tools) are converted in SQL as well.
+
+Requires NumPy.
+"""
+
+import os
+import sqlite3
+from datetime import date, datetime, timezone
+from urllib.parse import quote
+
+from .spec import SpecError
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PRISMA_DIR = os.path.join(REPO_ROOT, "prisma")
+
+MS_PER_HOUR = 3_600_000
+MS_PER_DAY = 24 * MS_PER_HOUR
+RESOLUTIONS = {"hour": (MS_PER_HOUR, "h"), "day": (MS_PER_DAY, "D")}
+PERCENTILES = (50, 90, 99)
+
+
+def resolve_database(path=None):
+    """Return the SQLite file to read: `path`, else `DATABASE_URL` as Prisma resolves it."""
+    if path:
+        return path
+    url = os.environ.get("DATABASE_URL", "file:./dev.db")
+    if not url.startswith("file:"):
+        raise ValueError(f"DATABASE_URL {url!r} is not a SQLite file URL")
+    # Prisma resolves relative SQLite paths against the schema's directory
+    return os.path.normpath(os.path.join(PRISMA_DIR, url[len("file:"):]))
+
+
+def connect(path=None):
+    """Open the database read-only."""
+    path = resolve_database(path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"SnapAndSend database not found: {path}")
+    return sqlite3.connect(f"file:{quote(os.path.abspath(path))}?mode=ro", uri=True)
+
+
+def epoch_ms(column):
+    """SQL expression converting a Prisma DateTime `column` to Unix milliseconds."""
+    return (
+        f"(CASE WHEN typeof({column}) IN ('integer', 'real') THEN {column} "
+        f"ELSE (julianday({column}) - 2440587.5) * 86400000.0 END)"
+    )
+
+
+def parse_since(value):
+    """Return the datetime a spec's `since` names, or None without one.
+
+    `value` is an ISO-8601 string, or a date as YAML loads one. Times
+    without an offset are UTC, like the timestamps Prisma stores; raises
+    SpecError for anything else.
+    """
+    if value is None or isinstance(value, datetime):
+        since = value
+    elif isinstance(value, date):
+        since = datetime(value.year, value.month, value.day)
+    else:
+        try:
+            since = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise SpecError(f"since: expected an ISO-8601 date or time, got {value!r}") from None
+    if since is not None and since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return since
+
+
+def _since_clause(since, column="createdAt"):
+    if since is None:
+        return "", ()
+    return f" WHERE {epoch_ms(column)} >= ?", (since.timestamp() * 1000,)
+
+
+def _percentiles(np, values):
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {"count": 0, **{f"p{p}": None for p in PERCENTILES}}
+    hours = np.percentile(values, PERCENTILES) / MS_PER_HOUR
+    return {"count": int(len(values)), **{f"p{p}": float(h) for p, h in zip(PERCENTILES, hours)}}
+
+
+def load_report_stats(path=None, since=None):
+    """Return counts, verification rates and response-time percentiles.
+
+    `since` (a datetime) restricts everything to reports created from then on.
+    Latencies are in hours: `to_investigating` (pending -> investigating),
+    `to_resolved` (investigating -> resolved) and `total` (pending -> resolved).
+    """
+    import numpy as np
+
+    where, params = _since_clause(since)
+    with connect(path) as conn:
+        by_status = dict(conn.execute(
+            f"SELECT status, COUNT(*) FROM Report{where} GROUP BY status ORDER BY COUNT(*) DESC", params))
+        by_category = dict(conn.execute(
+            f"SELECT category, COUNT(*) FROM Report{where} GROUP BY category ORDER BY COUNT(*) DESC", params))
+        total = sum(by_status.values())
+
+        # Verifications are counted from the Agreement rows themselves rather
+        # than the denormalized Report.agreementCount
+        report_filter = f" WHERE reportId IN (SELECT id FROM Report{where})" if where else ""
+        verified, verifications = conn.execute(
+            f"SELECT COUNT(DISTINCT reportId), COUNT(*) FROM Agreement{report_filter}", params
+        ).fetchone()
+
+        transitions = [
+            {"from": previous, "to": new, "count": count, "by_partner": by_partner}
+            for previous, new, count, by_partner in conn.execute(
+                "SELECT previousStatus, newStatus, COUNT(*), SUM(partnerId IS NOT NULL) "
+                f"FROM StatusLog{report_filter} GROUP BY previousStatus, newStatus ORDER BY COUNT(*) DESC",
+                params,
+            )
+        ]
+
+        # Only reports that progressed carry latencies; NULL timestamps become NaN
+        progressed = "investigatingAt IS NOT NULL OR resolvedAt IS NOT NULL"
+        cursor = conn.execute(
+            f"SELECT {epoch_ms('createdAt')}, "
+            f"IFNULL({epoch_ms('investigatingAt')}, -1), IFNULL({epoch_ms('resolvedAt')}, -1) "
+            f"FROM Report{where or ' WHERE 1'} AND ({progressed})",
+            params,
+        )
+        times = np.fromiter(cursor, dtype=np.dtype([("created", "f8"), ("investigating", "f8"), ("resolved", "f8")]))
+
+    created = times["created"]
+    investigating = np.where(times["investigating"] < 0, np.nan, times["investigating"])
+    resolved = np.where(times["resolved"] < 0, np.nan, times["resolved"])
+
+    return {
+        "total": total,
+        "by_status": by_status,
+        "by_category": by_category,
+        "verified_reports": int(verified),
+        "verification_rate": verified / total if total else 0.0,
+        "verifications_per_report": verifications / total if total else 0.0,
+        "transitions": transitions,
+        "latency_hours": {
+            "to_investigating": _percentiles(np, investigating - created),
+            "to_resolved": _percentiles(np, resolved - investigating),
+            "total": _percentiles(np, resolved - created),
+        },
+    }
+
+
+def load_report_series(path=None, since=None, resolution="day", by=None):
+    """Return `(periods, series)`: reports created per hour or day, as NumPy arrays.
+
+    `periods` is a datetime64 array of every period from the first report to
+    the last, empty ones included. `series` maps "Reports", or with `by`
+    ("status" or "category") each value of that column, most frequent
+    first, to one count per period. Counting happens in SQL; the counts are
+    scattered into the full grid in one NumPy operation.
+    """
+    import numpy as np
+
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"unknown resolution {resolution!r}; expected one of {', '.join(RESOLUTIONS)}")
+    if by not in (None, "status", "category"):
+        raise ValueError(f"can't break reports down by {by!r}; expected status or category")
+    step, unit = RESOLUTIONS[resolution]
+    where, params = _since_clause(since)
+    label = by or "'Reports'"
+    with connect(path) as conn:
+        rows = conn.execute(
+            f"SELECT CAST({epoch_ms('createdAt')} / {step} AS INTEGER) AS period, {label}, COUNT(*) "
+            f"FROM Report{where} GROUP BY period, {label}",
+            params,
+        ).fetchall()
+    if not rows:
+        return np.array([], dtype=f"datetime64[{unit}]"), {}
+
+    periods, labels, counts = zip(*rows)
+    periods = np.array(periods, dtype=np.int64)
+    names, label_index = np.unique(np.array(labels, dtype=object).astype(str), return_inverse=True)
+    first = periods.min()
+    grid = np.zeros((len(names), periods.max() - first + 1), dtype=np.int64)
+    np.add.at(grid, (label_index, periods - first), counts)
+
+    order = np.argsort(-grid.sum(axis=1), kind="stable")
+    timeline = np.arange(first, first + grid.shape[1]).astype(f"datetime64[{unit}]")
+    return timeline, {str(names[i]): grid[i] for i in order}
+
+
+def expand_trend_slide(spec):
+    """Expand a `trend` spec into a chart of reports per hour or day from the live database."""
+    since = parse_since(spec.get("since"))
+    resolution, by = spec.get("resolution", "day"), spec.get("by")
+    periods, series = load_report_series(spec.get("database"), since, resolution, by)
+    title = spec.get("title") or f"Reports per {resolution}" + (f" by {by}" if by else "")
+    if not len(periods):
+        # A chart needs at least one category
+        empty = {"kind": "content", "title": title, "content_items": ["No reports yet"]}
+        if spec.get("id"):
+            empty["id"] = spec["id"]
+        return [empty]
+    chart = {
+        "kind": "chart",
+        "title": title,
+        "chart_type": spec.get("chart_type", "stacked_column" if by else "line"),
+        "categories": periods,
+        "series": series,
+    }
+    if "max_points" in spec:
+        chart["max_points"] = spec["max_points"]
+    if spec.get("id"):
+        chart["id"] = spec["id"]
+    return [chart]
+
+
+def _hours(value):
+    if value is None:
+        return "–"
+    if value < 1:
+        return f"{value * 60:.0f} min"
+    if value < 48:
+        return f"{value:.1f} h"
+    return f"{value / 24:.1f} days"
+
+
+def stats_slides(stats, title="Incident Statistics", top_categories=10):
+    """Return content, chart and table slide specs presenting `stats`."""
+    latency_labels = {
+        "to_investigating": "Pending → Investigating",
+        "to_resolved": "Investigating → Resolved",
+        "total": "Pending → Resolved",
+    }
+    status_mix = ", ".join(f"{count:,} {status}" for status, count in stats["by_status"].items())
+    logged = sum(t["count"] for t in stats["transitions"])
+    by_partner = sum(t["by_partner"] or 0 for t in stats["transitions"])
+    categories = list(stats["by_category"].items())[:top_categories]
+    slides = [
+        {
+            "kind": "content",
+            "title": f"{title}: At a Glance",
+            "content_items": [
+                {"title": f"{stats['total']:,} reports", "desc": status_mix or "No reports yet"},
+                {
+                    "title": f"{stats['verification_rate']:.0%} community-verified",
+                    "desc": f"{stats['verified_reports']:,} reports confirmed by nearby users, "
+                            f"{stats['verifications_per_report']:.1f} verifications per report on average",
+                },
+                {
+                    "title": f"{logged:,} status changes logged",
+                    "desc": f"{by_partner:,} made through partner integrations via the External API",
+                },
+            ],
+        },
+    ]
+    # Charts need at least one category; with no reports the summary says so
+    if stats["by_status"]:
+        slides.append({
+            "kind": "chart",
+            "title": f"{title}: Reports by Status",
+            "chart_type": "column",
+            "categories": [status.capitalize() for status in stats["by_status"]],
+            "series": {"Reports": list(stats["by_status"].values())},
+        })
+    if categories:
+        slides.append({
+            "kind": "chart",
+            "title": f"{title}: Top Categories",
+            "chart_type": "bar",
+            "categories": [category for category, _ in reversed(categories)],
+            "series": {"Reports": [count for _, count in reversed(categories)]},
+        })
+    slides.append({
+        "kind": "table",
+        "title": f"{title}: Response Times",
+        "columns": ["Stage", "Reports", "Median", "90th percentile", "99th percentile"],
+        "column_widths": [3, 1.5, 1.5, 1.5, 1.5],
+        "rows": [
+            [label, f"{latency['count']:,}", _hours(latency["p50"]), _hours(latency["p90"]), _hours(latency["p99"])]
+            for key, label in latency_labels.items()
+            for latency in [stats["latency_hours"][key]]
+        ],
+    })
+    return slides
+
+
+def expand_stats_slide(spec):
+    """Expand a `stats` spec into chart and table slides built from the live database."""
+    since = parse_since(spec.get("since"))
+    stats = load_report_stats(spec.get("database"), since)
+    return stats_slides(stats, spec.get("title", "Incident Statistics"))
@@ -0,0 +1,130 @@
+"""
+Downsample long chart series to a point budget while keeping their shape.
+
+A year of hourly counts is 8,760 points per series. Charting all of them
+bloats the chart XML and its embedded workbook, and PowerPoint slows to a
+crawl drawing lines finer than the pixels they land on. `chart_series()`
+cuts long series down to `max_points`:
+
+- one series on a line chart uses Largest-Triangle-Three-Buckets (LTTB),
+  which keeps the points that carry the visual shape, peaks included;
+- several series (or bars) must share their categories, so each bucket
+  keeps the positions of every series' minimum and maximum.
+
+Both always keep the first and last point. Categories and values may be
+NumPy arrays; NaN values become gaps.
+
+Requires NumPy for arrays or series longer than `max_points`.
+"""
+
+import math
+
+MAX_CHART_POINTS = 500
+METHODS = ("auto", "lttb", "minmax", "none")
+
+
+def lttb(y, n, x=None):
+    """Return the sorted indices of the `n` points of `y` that LTTB keeps."""
+    import numpy as np
+
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    size = len(y)
+    if n >= size or n < 3:
+        return np.arange(size)
+    x = np.arange(size, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # n - 2 buckets between the fixed first and last points, each non-empty
+    # since size > n
+    edges = np.linspace(1, size - 1, n - 1).astype(int)
+    starts, ends = edges[:-1], edges[1:]
+    # Bucket means from prefix sums; the one after the last bucket is the last point
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    widths = ends - starts
+    mean_x = np.append((cum_x[ends] - cum_x[starts]) / widths, x[-1])
+    mean_y = np.append((cum_y[ends] - cum_y[starts]) / widths, y[-1])
+
+    selected = np.empty(n, dtype=np.intp)
+    selected[0], selected[-1] = 0, size - 1
+    a = 0
+    for i, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+        # Area of the triangle (previous pick, candidate, next bucket's mean)
+        area = np.abs(
+            (x[a] - mean_x[i + 1]) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (mean_y[i + 1] - y[a])
+        )
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(ys, n):
+    """Return the sorted indices keeping each series' min and max per bucket, at most about `n`.
+
+    `ys` is a 2-D array with one row per series.
+    """
+    import numpy as np
+
+    ys = np.atleast_2d(np.asarray(ys, dtype=float))
+    size = ys.shape[1]
+    if n >= size:
+        return np.arange(size)
+    buckets = max(1, (n - 2) // (2 * len(ys)))
+    edges = np.linspace(1, size - 1, buckets + 1).astype(int)
+    # Gaps never win a bucket
+    low = np.where(np.isnan(ys), np.inf, ys)
+    high = np.where(np.isnan(ys), -np.inf, ys)
+    picks = [np.array([0, size - 1])]
+    for start, end in zip(edges[:-1].tolist(), edges[1:].tolist()):
+        if end > start:
+            picks.append(start + low[:, start:end].argmin(axis=1))
+            picks.append(start + high[:, start:end].argmax(axis=1))
+    return np.unique(np.concatenate(picks))
+
+
+def _is_array(values):
+    return hasattr(values, "dtype") and hasattr(values, "tolist")
+
+
+def _categories(categories):
+    # datetime64 categories become dates (a date axis) when they fall on
+    # midnight, otherwise labels to the minute on a category axis
+    if _is_array(categories) and categories.dtype.kind == "M":
+        import numpy as np
+
+        days = categories.astype("datetime64[D]")
+        if (categories == days).all():
+            return days.tolist()
+        return np.datetime_as_string(categories, unit="m").astype(object).tolist()
+    return list(categories)
+
+
+def _values(values):
+    values = values.tolist() if _is_array(values) else list(values)
+    return [None if isinstance(v, float) and math.isnan(v) else v for v in values]
+
+
+def chart_series(categories, series, chart_type="column", max_points=MAX_CHART_POINTS, method="auto"):
+    """Return `(categories, series)` as lists, downsampled to `max_points` if longer.
+
+    `series` maps each name to its values. `method` is one of `METHODS`:
+    "auto" picks LTTB for a single line series and min/max bucketing
+    otherwise.
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown downsampling method {method!r}; expected one of {', '.join(METHODS)}")
+    count = len(categories)
+    if method != "none" and max_points and count > max_points:
+        import numpy as np
+
+        values = np.array([np.asarray(v, dtype=float) for v in series.values()])
+        if method == "lttb" or (method == "auto" and len(series) == 1 and chart_type == "line"):
+            # LTTB of several series would pick different points for each;
+            # they share categories, so it runs on their sum
+            keep = lttb(values.sum(axis=0) if len(values) > 1 else values[0], max_points)
+        else:
+            keep = minmax_indices(values, max_points)
+        if not _is_array(categories):
+            categories = np.array(categories, dtype=object)
+        categories = categories[keep]
+        series = {name: np.asarray(v)[keep] for name, v in series.items()}
+    return _categories(categories), {name: _values(v) for name, v in series.items()}
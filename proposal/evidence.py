@@ -0,0 +1,205 @@
+"""
+Evidence photo galleries for incident appendices.
+
+Report photos (`Image.imageUrl`) and resolution evidence
+(`Report.resolutionEvidence`) are served from the repository's `uploads/`
+directory as `/uploads/<file>`. Full-size phone photos would make a deck
+enormous and slow to save, so every photo goes through a thumbnail pipeline
+first:
+
+- files are read once and keyed by the SHA-256 of their bytes, so the many
+  identical photos duplicate-merging attaches to one report are processed,
+  and stored in the package, only once;
+- distinct photos are decoded at reduced size (JPEG draft mode), downscaled
+  to display resolution and re-encoded on a thread pool — Pillow releases
+  the GIL while decoding, resizing and encoding;
+- thumbnails are cached on disk by content hash and size under the slide
+  cache directory, so re-rendering the appendix doesn't touch the originals
+  again; without a cache directory they are kept in memory.
+
+Remote evidence URLs are skipped; only local uploads are embedded.
+"""
+
+import hashlib
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from .datasource import REPO_ROOT, connect
+
+UPLOADS_DIR = os.path.join(REPO_ROOT, "uploads")
+# Thumbnails are kept in this subdirectory of the slide cache
+THUMBNAIL_CACHE_DIR = "thumbnails"
+
+# Longest edge of a thumbnail: a third of the slide width at ~150 dpi
+THUMBNAIL_PX = 640
+JPEG_QUALITY = 80
+
+
+def resolve_upload(url, uploads_dir=UPLOADS_DIR):
+    """Return the local file behind an upload URL, or None for remote or missing files."""
+    if not url or "://" in url:
+        return None
+    name = url.split("/uploads/", 1)[-1].lstrip("/")
+    path = os.path.normpath(os.path.join(uploads_dir, name))
+    if not path.startswith(os.path.normpath(uploads_dir) + os.sep) or not os.path.isfile(path):
+        return None
+    return path
+
+
+def _content_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _make_thumbnail(source, target, max_px, quality):
+    # Writes the thumbnail to the path `target`, or returns it in memory
+    # when `target` is None
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        image.thumbnail((max_px, max_px), reducing_gap=2.0)
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        if target is None:
+            stream = io.BytesIO()
+            image.save(stream, "JPEG", quality=quality, optimize=True)
+            return stream
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        try:
+            image.save(tmp_path, "JPEG", quality=quality, optimize=True)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    os.replace(tmp_path, target)
+    return target
+
+
+def _thumbnail_result(job, path):
+    # A photo Pillow can't decode (UnidentifiedImageError is an OSError) is
+    # reported and left out rather than failing the whole gallery
+    if isinstance(job, str):
+        return job
+    try:
+        return job.result()
+    except OSError as e:
+        print(f"warning: skipping photo {path}: {e}", file=sys.stderr)
+        return None
+
+
+def prepare_thumbnails(paths, max_px=THUMBNAIL_PX, quality=JPEG_QUALITY, workers=None, cache_dir=None):
+    """Return `{path: thumbnail}` for `paths`, one thumbnail per distinct content.
+
+    Thumbnails are files in `cache_dir`, reused across runs, or in-memory
+    JPEG streams without one. Photos that can't be read or decoded are
+    reported on stderr and left out of the result.
+    """
+    unique_paths = list(dict.fromkeys(paths))
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+    workers = workers or min(8, (os.cpu_count() or 1) * 2)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        digests = dict(zip(unique_paths, pool.map(_content_hash, unique_paths)))
+
+        pending, sources = {}, {}
+        for path, digest in digests.items():
+            if digest in pending:
+                continue
+            sources[digest] = path
+            if cache_dir is None:
+                pending[digest] = pool.submit(_make_thumbnail, path, None, max_px, quality)
+                continue
+            target = os.path.join(cache_dir, f"{digest}-{max_px}-{quality}.jpg")
+            if os.path.exists(target):
+                pending[digest] = target
+            else:
+                pending[digest] = pool.submit(_make_thumbnail, path, target, max_px, quality)
+        thumbnails = {digest: _thumbnail_result(job, sources[digest]) for digest, job in pending.items()}
+
+    return {path: thumbnails[digest] for path, digest in digests.items() if thumbnails[digest] is not None}
+
+
+def load_incident_photos(path=None, report_ids=None, status=None, limit=None):
+    """Return incidents with their photo and evidence URLs, newest first."""
+    clauses, params = [], []
+    if report_ids:
+        clauses.append(f"id IN ({', '.join('?' * len(report_ids))})")
+        params.extend(report_ids)
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    limit_clause = f" LIMIT {int(limit)}" if limit else ""
+
+    with connect(path) as conn:
+        incidents = [
+            {"id": id_, "title": title, "category": category, "status": status_,
+             "evidence": evidence, "images": []}
+            for id_, title, category, status_, evidence in conn.execute(
+                "SELECT id, title, category, status, resolutionEvidence FROM Report"
+                f"{where} ORDER BY createdAt DESC{limit_clause}",
+                params,
+            )
+        ]
+        by_id = {incident["id"]: incident for incident in incidents}
+        ids = list(by_id)
+        # Bounded IN lists keep within SQLite's host-parameter limit
+        for start in range(0, len(ids), 500):
+            batch = ids[start:start + 500]
+            for report_id, url in conn.execute(
+                f"SELECT reportId, imageUrl FROM Image WHERE reportId IN ({', '.join('?' * len(batch))}) "
+                "ORDER BY createdAt",
+                batch,
+            ):
+                by_id[report_id]["images"].append(url)
+    return incidents
+
+
+def gallery_slides(incidents, title="Evidence", per_slide=6, uploads_dir=UPLOADS_DIR, **thumbnail_options):
+    """Return gallery slide specs showing every local photo of `incidents`.
+
+    `thumbnail_options` are passed on to `prepare_thumbnails()`.
+    """
+    entries = []
+    for incident in incidents:
+        label = f"{incident['title']} · {incident['category']}"
+        for url in incident["images"]:
+            entries.append((resolve_upload(url, uploads_dir), label))
+        entries.append((resolve_upload(incident.get("evidence"), uploads_dir), f"Resolved: {incident['title']}"))
+    entries = [(path, caption) for path, caption in entries if path]
+
+    thumbnails = prepare_thumbnails([path for path, _ in entries], **thumbnail_options)
+    entries = [(path, caption) for path, caption in entries if path in thumbnails]
+    pages = [entries[i:i + per_slide] for i in range(0, len(entries), per_slide)]
+    return [
+        {
+            "kind": "gallery",
+            "title": title if number == 1 else f"{title} (cont.)",
+            "images": [{"image": thumbnails[path], "caption": caption} for path, caption in page],
+        }
+        for number, page in enumerate(pages, start=1)
+    ]
+
+
+def expand_evidence_slide(spec, cache_dir=None):
+    """Expand an `evidence` spec into gallery slides of incident photos.
+
+    Thumbnails are cached under `cache_dir` (see `THUMBNAIL_CACHE_DIR`), if given.
+    """
+    incidents = load_incident_photos(
+        spec.get("database"), spec.get("report_ids"), spec.get("status"), spec.get("limit", 50)
+    )
+    return gallery_slides(
+        incidents,
+        title=spec.get("title", "Evidence"),
+        per_slide=spec.get("per_slide", 6),
+        uploads_dir=spec.get("uploads_dir", UPLOADS_DIR),
+        cache_dir=os.path.join(cache_dir, THUMBNAIL_CACHE_DIR) if cache_dir is not None else None,
+    )
@@ -0,0 +1,318 @@
+"""
+Per-partner numbers from the SnapAndSend External API, fetched concurrently.
+
+Every `ApiPartner` gets a deck with its own figures from
+`GET /api/external/stats` and `GET /api/external/incidents` (see
+`server/routes/external.ts`), requested with that partner's API key.
+`fetch_partners()` runs all of those requests from one asyncio event loop:
+
+- at most `concurrency` requests are in flight at once;
+- each runs on a pooled keep-alive `http.client` connection, so hundreds
+  of partners share a handful of TCP connections instead of opening one
+  per request;
+- connection errors, 429 and 5xx responses are retried with exponential
+  backoff and jitter, honouring `Retry-After`;
+- responses go into a TTL on-disk cache (`ResponseCache`), so re-rendering
+  within `ttl` seconds doesn't hit the API again.
+
+Incident listings are paged at the API maximum of 500. Once the first page
+gives the total, the remaining pages are fetched concurrently.
+
+    python -m proposal.external --base-url http://localhost:5002/api/external \\
+        [--partners partners.json | --database prisma/dev.db] --out manifest.json
+
+writes a `proposal.batch` manifest with one variant per partner.
+`proposal.stub_api` serves the same endpoints locally for trying this out
+without the Express backend.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import http.client
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+DEFAULT_BASE_URL = "http://localhost:5002/api/external"
+DEFAULT_CACHE_DIR = os.path.join(".deck-cache", "api")
+PAGE_SIZE = 500  # the API's maximum `limit`
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class ExternalApiError(RuntimeError):
+    """Raised for a response that retrying won't fix, or once retries run out."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class ResponseCache:
+    """JSON responses on disk, valid for `ttl` seconds after they were stored."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, ttl=300):
+        self.directory = directory
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, url, api_key):
+        # The key is part of the request: partners may see different data
+        return hashlib.sha256(f"{api_key}\n{url}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """Return the body stored under `key` if it is younger than `ttl`, else None."""
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                raise FileNotFoundError(path)
+            with open(path, encoding="utf-8") as f:
+                body = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return body
+
+    def put(self, key, body):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(body, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class ExternalApiClient:
+    """Async client for the External API over a pool of keep-alive connections.
+
+    Use as `async with ExternalApiClient(...) as client:`. `http.client` is
+    blocking, so each request runs on one of `concurrency` worker threads
+    holding a pooled connection, while the event loop schedules the requests,
+    the retries and their backoff.
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, concurrency=8, retries=4, backoff=0.5, timeout=10.0,
+                 cache=None):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"unsupported base URL {base_url!r}")
+        self._connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._host = parts.netloc
+        self._prefix = parts.path.rstrip("/")
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = cache
+        self.requests = 0
+        self.connections_opened = 0
+        self._pool = None
+        self._executor = None
+
+    async def __aenter__(self):
+        # Slots are connections, or None until a request first needs one
+        self._pool = asyncio.LifoQueue()
+        for _ in range(self.concurrency):
+            self._pool.put_nowait(None)
+        self._executor = ThreadPoolExecutor(self.concurrency, thread_name_prefix="external-api")
+        return self
+
+    async def __aexit__(self, *exc_info):
+        while not self._pool.empty():
+            connection = self._pool.get_nowait()
+            if connection is not None:
+                connection.close()
+        self._executor.shutdown()
+
+    def _request(self, connection, path, api_key):
+        # Runs on a worker thread
+        if connection is None:
+            connection = self._connection_class(self._host, timeout=self.timeout)
+            self.connections_opened += 1
+        try:
+            connection.request("GET", path, headers={"X-API-Key": api_key, "Accept": "application/json"})
+            response = connection.getresponse()
+            body = response.read()  # read to the end so the connection can be reused
+        except Exception:
+            connection.close()
+            raise
+        if response.will_close:
+            connection.close()
+            connection = None
+        return connection, response.status, response.getheader("Retry-After"), body
+
+    async def get_json(self, path, api_key, params=None):
+        """Return the decoded JSON body of `GET {base_url}{path}?{params}` sent with `api_key`."""
+        query = urlencode(sorted((k, v) for k, v in (params or {}).items() if v is not None))
+        full_path = f"{self._prefix}{path}?{query}" if query else f"{self._prefix}{path}"
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(f"{self._host}{full_path}", api_key)
+            body = self.cache.get(key)
+            if body is not None:
+                return body
+
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retries + 1):
+            connection = await self._pool.get()
+            retry_after = None
+            try:
+                self.requests += 1
+                connection, status, retry_after, raw = await loop.run_in_executor(
+                    self._executor, self._request, connection, full_path, api_key
+                )
+            except (OSError, http.client.HTTPException) as e:
+                connection, error = None, ExternalApiError(f"GET {full_path}: {e}")
+            else:
+                if status == 200:
+                    try:
+                        body = json.loads(raw)
+                    except ValueError as e:
+                        raise ExternalApiError(f"GET {full_path}: malformed JSON ({e}): {raw[:200]!r}", status) from None
+                    if key is not None:
+                        self.cache.put(key, body)
+                    return body
+                error = ExternalApiError(f"GET {full_path}: HTTP {status} {raw[:200]!r}", status)
+                if status not in RETRY_STATUSES:
+                    raise error
+            finally:
+                self._pool.put_nowait(connection)
+
+            if attempt < self.retries:
+                delay = self.backoff * 2 ** attempt * (0.5 + random.random())
+                if retry_after is not None and retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+                await asyncio.sleep(delay)
+        raise error
+
+    async def stats(self, api_key, since=None):
+        """Return the `data` of `GET /stats`."""
+        return (await self.get_json("/stats", api_key, {"since": since}))["data"]
+
+    async def incidents(self, api_key, **filters):
+        """Return every incident `GET /incidents` lists for `filters` (status, category, since, ...)."""
+        first = await self.get_json("/incidents", api_key, dict(filters, limit=PAGE_SIZE, offset=0))
+        total = first["pagination"]["total"]
+        pages = await asyncio.gather(*(
+            self.get_json("/incidents", api_key, dict(filters, limit=PAGE_SIZE, offset=offset))
+            for offset in range(PAGE_SIZE, total, PAGE_SIZE)
+        ))
+        return [incident for page in [first, *pages] for incident in page["data"]]
+
+
+async def _fetch_partner(client, partner):
+    since = partner.get("since")
+    try:
+        stats, incidents = await asyncio.gather(
+            client.stats(partner["apiKey"], since=since),
+            client.incidents(partner["apiKey"], since=since, **partner.get("filters", {})),
+        )
+    except (KeyError, TypeError) as e:
+        # Valid JSON, but not in the shape the API documents
+        raise ExternalApiError(f"unexpected response ({type(e).__name__}: {e})") from None
+    return {"stats": stats, "incidents": incidents}
+
+
+async def fetch_partners_async(partners, base_url=DEFAULT_BASE_URL, concurrency=8, cache=None, **client_options):
+    """Fetch stats and incidents for every partner; return `{partner name: {"stats", "incidents"}}`.
+
+    A partner is a mapping with `name` and `apiKey`, and optionally `since`
+    (ISO date) and `filters` for `/incidents`. A partner whose requests fail
+    maps to the `ExternalApiError` instead, so one bad key doesn't sink the
+    batch.
+    """
+    async with ExternalApiClient(base_url, concurrency, cache=cache, **client_options) as client:
+        results = await asyncio.gather(
+            *(_fetch_partner(client, partner) for partner in partners), return_exceptions=True
+        )
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, ExternalApiError):
+            raise result
+    return {partner["name"]: result for partner, result in zip(partners, results)}
+
+
+def fetch_partners(partners, base_url=DEFAULT_BASE_URL, concurrency=8, cache=None, **client_options):
+    """Synchronous wrapper around `fetch_partners_async()`."""
+    return asyncio.run(fetch_partners_async(partners, base_url, concurrency, cache, **client_options))
+
+
+def load_partners(path=None):
+    """Return the active partners (`name`, `apiKey`) from the `ApiPartner` table."""
+    from contextlib import closing
+
+    from .datasource import connect
+
+    with closing(connect(path)) as conn:
+        rows = conn.execute("SELECT name, apiKey FROM ApiPartner WHERE isActive ORDER BY name").fetchall()
+    return [{"name": name, "apiKey": api_key} for name, api_key in rows]
+
+
+def partner_variant(name, data):
+    """Return a `proposal.batch` variant presenting one partner's numbers."""
+    stats, incidents = data["stats"], data["incidents"]
+    by_status = stats.get("byStatus", {})
+    top = sorted(stats.get("byCategory", {}).items(), key=lambda item: (-item[1], item[0]))[:3]
+    figures = {
+        "Reports": stats["total"],
+        "Last 24 hours": stats["last24Hours"],
+        "Pending": by_status.get("pending", 0),
+        "Resolved": by_status.get("resolved", 0),
+        "Community verifications": sum(incident.get("verificationCount", 0) for incident in incidents),
+    }
+    if top:
+        figures["Top categories"] = ", ".join(f"{category} ({count})" for category, count in top)
+    return {"name": name, "region": name, "stats": figures}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch per-partner numbers from the External API into a batch manifest.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--partners", help='JSON list of {"name", "apiKey", "since"?, "filters"?}')
+    source.add_argument("--database", help="read active partners from this SQLite database (default: DATABASE_URL)")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="External API base URL (default: %(default)s)")
+    parser.add_argument("--out", default="manifest.json", help="batch manifest to write (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight at once (default: %(default)s)")
+    parser.add_argument("--retries", type=int, default=4, help="retries per request (default: %(default)s)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="response cache directory (default: %(default)s)")
+    parser.add_argument("--ttl", type=float, default=300, help="seconds a cached response stays valid (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="always hit the API")
+    args = parser.parse_args(argv)
+
+    if args.partners:
+        with open(args.partners, encoding="utf-8") as f:
+            partners = json.load(f)
+    else:
+        partners = load_partners(args.database)
+
+    cache = None if args.no_cache else ResponseCache(args.cache_dir, args.ttl)
+    start = time.perf_counter()
+    results = fetch_partners(partners, args.base_url, args.concurrency, cache, retries=args.retries)
+    elapsed = time.perf_counter() - start
+
+    variants, failed = [], 0
+    for name, result in results.items():
+        if isinstance(result, ExternalApiError):
+            print(f"warning: {name}: {result}", file=sys.stderr)
+            failed += 1
+        else:
+            variants.append(partner_variant(name, result))
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(variants, f, indent=2, ensure_ascii=False)
+
+    cached = f", {cache.hits} from cache" if cache is not None else ""
+    print(f"Fetched {len(variants)} partners in {elapsed:.2f}s ({failed} failed{cached}); wrote {args.out}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
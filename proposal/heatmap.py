@@ -0,0 +1,240 @@
+"""
+Incident heatmaps binned from report coordinates.
+
+Reports are binned onto a geohash-aligned grid: at precision p a cell spans
+360 / 2**ceil(5p/2) degrees of longitude and 180 / 2**floor(5p/2) of
+latitude, exactly like a geohash cell. Points inside the bounding box are
+read in one indexed query, turned into flat cell indices with NumPy and
+counted with `np.bincount` (optionally weighted by `agreementCount`), with
+no per-point Python.
+
+Binned grids are cached per bounding box, precision, category and weight
+under the slide cache directory, and invalidated when the database file
+changes, so regenerating a region's deck re-renders the PNG from the cached
+grid without touching the reports. Without a cache directory nothing is
+written: the grid is binned afresh and the PNG kept in memory.
+
+Requires NumPy; images are written with Pillow.
+"""
+
+import hashlib
+import io
+import json
+import math
+import os
+
+from .datasource import connect, resolve_database
+
+# Grids and PNGs are kept in this subdirectory of the slide cache
+TILE_CACHE_DIR = "heatmap"
+
+# Columns reports may be weighted by
+WEIGHT_COLUMNS = ("agreementCount",)
+
+# Widest and highest grid, in cells, a heatmap is binned on by default
+MAX_CELLS = 160
+
+# Colour ramp from no incidents to the densest cell
+RAMP = [
+    (0.0, (249, 250, 251)),   # Gray-50
+    (0.15, (209, 250, 229)),  # Emerald-100
+    (0.45, (16, 185, 129)),   # Emerald-500
+    (0.75, (245, 158, 11)),   # Amber-500
+    (1.0, (239, 68, 68)),     # Red-500
+]
+
+
+def cell_size(precision):
+    """Return `(lat_degrees, lng_degrees)` of a geohash cell at `precision`."""
+    bits = 5 * precision
+    return 180 / 2 ** (bits // 2), 360 / 2 ** ((bits + 1) // 2)
+
+
+def grid_shape(bbox, precision):
+    """Return `(row0, col0, rows, cols)`: the geohash-aligned grid of cells covering `bbox`.
+
+    `row0` and `col0` index its south-west cell from latitude -90 and
+    longitude -180.
+    """
+    south, west, north, east = bbox
+    lat_size, lng_size = cell_size(precision)
+    row0 = math.floor((south + 90) / lat_size)
+    col0 = math.floor((west + 180) / lng_size)
+    rows = math.floor((north + 90) / lat_size) - row0 + 1
+    cols = math.floor((east + 180) / lng_size) - col0 + 1
+    return row0, col0, rows, cols
+
+
+def auto_precision(bbox, max_cells=MAX_CELLS):
+    """Return the finest precision whose grid over `bbox` is at most `max_cells` wide and high."""
+    for precision in range(12, 0, -1):
+        _, _, rows, cols = grid_shape(bbox, precision)
+        if rows <= max_cells and cols <= max_cells:
+            return precision
+    return 1
+
+
+def data_bbox(path=None, category=None):
+    """Return `[south, west, north, east]` covering every report (of `category`), or None without any."""
+    where, params = ("WHERE category = ?", (category,)) if category else ("", ())
+    with connect(path) as conn:
+        row = conn.execute(
+            f"SELECT MIN(latitude), MIN(longitude), MAX(latitude), MAX(longitude) FROM Report {where}", params
+        ).fetchone()
+    return list(row) if row[0] is not None else None
+
+
+def _fingerprint(path):
+    # The WAL holds committed rows not yet checkpointed into the main file
+    parts = []
+    for name in (path, f"{path}-wal"):
+        try:
+            stat = os.stat(name)
+        except OSError:
+            continue
+        parts.append((os.path.abspath(name), stat.st_mtime_ns, stat.st_size))
+    return parts
+
+
+def bin_reports(bbox, precision, path=None, category=None, weight=None, cache_dir=None, max_cells=MAX_CELLS):
+    """Return `(grid, origin)` counting reports per cell inside `bbox`.
+
+    `grid` is a float array of shape (rows, cols) with row 0 the southern
+    edge; `origin` is the `(lat, lng)` of its south-west corner, aligned to
+    the geohash grid. Grids more than `max_cells` wide or high are refused.
+    Grids are cached in `cache_dir`, if given.
+    """
+    import numpy as np
+
+    if weight is not None and weight not in WEIGHT_COLUMNS:
+        raise ValueError(f"cannot weight by {weight!r}; expected one of {', '.join(WEIGHT_COLUMNS)}")
+
+    path = resolve_database(path)
+    south, west, north, east = bbox
+    lat_size, lng_size = cell_size(precision)
+    row0, col0, rows, cols = grid_shape(bbox, precision)
+    if rows > max_cells or cols > max_cells:
+        raise ValueError(
+            f"a {rows}×{cols} grid at precision {precision} exceeds {max_cells} cells; use a coarser precision"
+        )
+    origin = (row0 * lat_size - 90, col0 * lng_size - 180)
+
+    tile_path = None
+    if cache_dir is not None:
+        key = hashlib.sha256(json.dumps(
+            [_fingerprint(path), [round(v, 9) for v in bbox], precision, category, weight]
+        ).encode()).hexdigest()
+        tile_path = os.path.join(cache_dir, f"{key}.npy")
+        if os.path.exists(tile_path):
+            return np.load(tile_path), origin
+
+    sql = (
+        f"SELECT latitude, longitude, {weight or 1} FROM Report "
+        "WHERE latitude BETWEEN ? AND ? AND longitude BETWEEN ? AND ?"
+    )
+    params = [south, north, west, east]
+    if category:
+        sql += " AND category = ?"
+        params.append(category)
+
+    with connect(path) as conn:
+        points = np.fromiter(
+            conn.execute(sql, params), dtype=np.dtype([("lat", "f8"), ("lng", "f8"), ("weight", "f8")])
+        )
+
+    row = np.floor((points["lat"] + 90) / lat_size).astype(np.int64) - row0
+    col = np.floor((points["lng"] + 180) / lng_size).astype(np.int64) - col0
+    np.clip(row, 0, rows - 1, out=row)
+    np.clip(col, 0, cols - 1, out=col)
+    grid = np.bincount(row * cols + col, weights=points["weight"], minlength=rows * cols).reshape(rows, cols)
+
+    if tile_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{tile_path}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, grid)
+        os.replace(tmp_path, tile_path)
+    return grid, origin
+
+
+def _color_lut(np):
+    stops = np.array([stop for stop, _ in RAMP])
+    colors = np.array([color for _, color in RAMP], dtype=float)
+    levels = np.linspace(0, 1, 256)
+    return np.stack([np.interp(levels, stops, colors[:, c]) for c in range(3)], axis=1).astype(np.uint8)
+
+
+def render_png(grid, precision, origin, out, width=1400):
+    """Write `grid` as a palette PNG `width` pixels wide, north up, with true aspect ratio.
+
+    `out` is a path or a binary file object; it is returned.
+    """
+    import numpy as np
+    from PIL import Image
+
+    # Log scale so a few hot spots don't wash out everything else
+    intensity = np.log1p(grid)
+    peak = intensity.max()
+    levels = np.zeros(grid.shape, dtype=np.uint8) if peak == 0 else (intensity / peak * 255).astype(np.uint8)
+
+    image = Image.fromarray(np.flipud(levels), mode="L").convert("P")
+    image.putpalette(_color_lut(np).ravel().tolist())
+
+    lat_size, lng_size = cell_size(precision)
+    rows, cols = grid.shape
+    mid_lat = math.radians(origin[0] + rows * lat_size / 2)
+    aspect = (rows * lat_size) / (cols * lng_size * max(math.cos(mid_lat), 0.01))
+    image = image.resize((width, max(1, round(width * aspect))), Image.NEAREST)
+
+    if isinstance(out, (str, os.PathLike)):
+        os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    image.save(out, "PNG", optimize=True)
+    return out
+
+
+def render_blank_png(out, width=1400, height=788):
+    """Write an empty map, in the colour of a cell without incidents, as a PNG; `out` is returned."""
+    from PIL import Image
+
+    Image.new("RGB", (width, height), RAMP[0][1]).save(out, "PNG", optimize=True)
+    return out
+
+
+def expand_heatmap_slide(spec, cache_dir=None):
+    """Expand a `heatmap` spec into an image slide of the binned reports.
+
+    Grids and images are cached under `cache_dir` (see `TILE_CACHE_DIR`),
+    if given.
+    """
+    tile_dir = os.path.join(cache_dir, TILE_CACHE_DIR) if cache_dir is not None else None
+    path = spec.get("database")
+    category = spec.get("category")
+    weight = spec.get("weight")
+    title = spec.get("title", "Where Incidents Happen")
+    bbox = spec.get("bbox") or data_bbox(path, category)
+    if bbox is None:
+        # Nothing to map yet; the slide stays, with a blank map saying so
+        caption = f"No reports{f' in {category}' if category else ''} to map yet"
+        return [{"kind": "image", "title": title, "image": render_blank_png(io.BytesIO()), "caption": caption}]
+    # An explicit precision is a ceiling: it is coarsened to fit `max_cells`
+    max_cells = spec.get("max_cells", MAX_CELLS)
+    precision = min(spec.get("precision") or 12, auto_precision(bbox, max_cells))
+
+    grid, origin = bin_reports(bbox, precision, path, category, weight, tile_dir, max_cells)
+    if tile_dir is not None:
+        png_key = hashlib.sha256(grid.tobytes() + json.dumps([grid.shape, precision, origin]).encode()).hexdigest()
+        png = render_png(grid, precision, origin, os.path.join(tile_dir, f"{png_key}.png"))
+    else:
+        png = render_png(grid, precision, origin, io.BytesIO())
+
+    south, west, north, east = bbox
+    counted = "verifications" if weight else "reports"
+    caption = (
+        f"{int(grid.sum()):,} {counted}{f' in {category}' if category else ''} · "
+        f"{south:.3f}°…{north:.3f}° lat, {west:.3f}°…{east:.3f}° lng · geohash precision {precision}"
+    )
+    return [{
+        "kind": "image",
+        "title": title,
+        "image": png,
+        "caption": caption,
+    }]
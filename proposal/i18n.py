@@ -0,0 +1,136 @@
+"""
+Per-locale slide text and multi-locale deck generation.
+
+The spec holds the deck's structure and its text in `SOURCE_LOCALE`. Every
+other locale is a catalog in `proposal/locales/<locale>.json` that mirrors
+the spec by slide id and gives only the text:
+
+    {"locale": "fr", "name": "Français", "slides": {
+        "problem": {"title": "Le problème que nous résolvons",
+                    "content_items": [{"title": "...", "desc": "..."}, ...]},
+        ...
+    }}
+
+Dicts are merged key by key, and lists of the same length item by item, so a
+catalog never repeats a slide's kind, layout arguments or numbers. Anything
+it leaves out stays in the source language.
+
+`build_locales()` renders every requested locale in one process. The
+template layouts are built once and loaded from a blob for each deck. The
+slide cache is shared, so slides whose text doesn't change between locales
+(charts, tables of numbers) are only built once. With `fork=True`, the
+source locale is rendered first to warm imports, font metrics and the
+cache, and every other locale is then rendered in a child forked from that
+warm parent. An extra language then costs only its own text.
+"""
+
+import io
+import json
+import os
+import time
+
+LOCALES_DIR = os.path.join(os.path.dirname(__file__), "locales")
+SOURCE_LOCALE = "en"
+
+# State shared with forked children by build_locales()
+_fork_state = None
+
+
+def available_locales():
+    """Return the source locale followed by every locale with a catalog, sorted."""
+    names = sorted(
+        os.path.splitext(name)[0] for name in os.listdir(LOCALES_DIR) if name.endswith(".json")
+    ) if os.path.isdir(LOCALES_DIR) else []
+    return [SOURCE_LOCALE] + [name for name in names if name != SOURCE_LOCALE]
+
+
+def load_catalog(locale):
+    """Return the catalog for `locale`; the source locale's is empty."""
+    if locale == SOURCE_LOCALE:
+        return {"locale": SOURCE_LOCALE, "slides": {}}
+    path = os.path.join(LOCALES_DIR, f"{locale}.json")
+    if not os.path.exists(path):
+        raise ValueError(f"no catalog for locale {locale!r}; available: {', '.join(available_locales())}")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _merge(base, override):
+    if isinstance(base, dict) and isinstance(override, dict):
+        merged = dict(base)
+        for key, value in override.items():
+            merged[key] = _merge(base[key], value) if key in base else value
+        return merged
+    if isinstance(base, list) and isinstance(override, list) and len(base) == len(override):
+        return [_merge(b, o) for b, o in zip(base, override)]
+    return override
+
+
+def localize(slides, catalog):
+    """Return `slides` with the text from `catalog` merged over each slide with a matching id.
+
+    Slides the catalog doesn't mention are returned as they are, not copied.
+    """
+    entries = catalog.get("slides", {})
+    return [_merge(slide, entries[slide["id"]]) if slide.get("id") in entries else slide for slide in slides]
+
+
+def locale_path(out, locale):
+    """Return the output path for `locale`: `deck.pptx` becomes `deck.fr.pptx`."""
+    stem, ext = os.path.splitext(os.fspath(out))
+    return f"{stem}.{locale}{ext or '.pptx'}"
+
+
+def _render_locale(locale):
+    from .render import build_presentation
+    from .writer import save_deck
+
+    state = _fork_state
+    start = time.perf_counter()
+    slides = localize(state["slides"], state["catalogs"][locale])
+    prs = build_presentation(
+        slides, state["cache"], template=io.BytesIO(state["template"]), backend=state["backend"]
+    )
+    path = locale_path(state["out"], locale)
+    save_deck(prs, path, **state["save_options"])
+    return locale, path, time.perf_counter() - start
+
+
+def build_locales(spec, out, locales=None, cache_dir=None, backend="pptx", fork=False, **save_options):
+    """Render `spec` once per locale to `locale_path(out, locale)`; return `(locale, path, seconds)` per deck.
+
+    `locales` defaults to every available locale. `fork` renders the locales
+    after the first in children forked from this process once it is warm;
+    where fork isn't available they are rendered here one after another.
+    `save_options` are passed on to `proposal.writer.save_deck()`.
+    """
+    global _fork_state
+    from .cache import SlideCache
+    from .templates import template_blob
+
+    locales = list(locales or available_locales())
+    _fork_state = {
+        "slides": spec["slides"],
+        "catalogs": {locale: load_catalog(locale) for locale in locales},
+        "cache": SlideCache(cache_dir) if cache_dir else None,
+        "template": template_blob(),
+        "backend": backend,
+        "out": out,
+        "save_options": save_options,
+    }
+    try:
+        # The first deck warms everything the others share
+        results = [_render_locale(locales[0])]
+        rest = locales[1:]
+
+        import multiprocessing
+        if fork and rest and "fork" in multiprocessing.get_all_start_methods():
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(len(rest), mp_context=multiprocessing.get_context("fork")) as pool:
+                results.extend(pool.map(_render_locale, rest))
+        else:
+            results.extend(_render_locale(locale) for locale in rest)
+        return results
+    finally:
+        _fork_state = None
@@ -0,0 +1,188 @@
+"""
+Render slide specs into a Presentation.
+
+Specs are first expanded into the slides that will actually be built: an
+expander may adjust a spec (e.g. shrink its text to fit) or split it over
+several slides. With a `SlideCache`, each slide is looked up by the hash of its spec and
+builder version first. Hits are spliced in from the cached `p:cSld` XML;
+misses go through the builder and are stored for the next run. Slides
+expanded from the database (`DATA_KINDS`) change with the data, so they
+bypass the cache rather than fill it with pages no later run asks for.
+
+The "compiled" backend renders the kinds in `proposal.compiled.COMPILERS`
+from string templates instead of the python-pptx object model; the slides
+are identical and an order of magnitude cheaper to build. Other kinds
+always go through their builder.
+"""
+
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from lxml import etree
+
+from .builders import BUILDER_VERSIONS, BUILDERS
+from .compiled import COMPILERS, add_slide
+from .spec import SLIDE_KINDS
+from .templates import TEMPLATE_VERSION, get_layout, new_presentation, prune_unused_layouts
+from .textfit import fit_content_slide
+
+BACKENDS = ("pptx", "compiled")
+
+# Kinds expanded from the database
+DATA_KINDS = frozenset(kind for kind, (_, optional) in SLIDE_KINDS.items() if "database" in optional)
+
+
+def _expand_content(spec, cache_dir):
+    return fit_content_slide(spec)
+
+
+def _expand_stats(spec, cache_dir):
+    from .datasource import expand_stats_slide
+    return expand_stats_slide(spec)
+
+
+def _expand_trend(spec, cache_dir):
+    from .datasource import expand_trend_slide
+    return expand_trend_slide(spec)
+
+
+def _expand_heatmap(spec, cache_dir):
+    from .heatmap import expand_heatmap_slide
+    return expand_heatmap_slide(spec, cache_dir)
+
+
+def _expand_evidence(spec, cache_dir):
+    from .evidence import expand_evidence_slide
+    return expand_evidence_slide(spec, cache_dir)
+
+
+def _expand_incidents(spec, cache_dir):
+    from .appendix import expand_incidents_slide
+    return expand_incidents_slide(spec)
+
+
+def _expand_case_histories(spec, cache_dir):
+    from .timeline import expand_case_histories_slide
+    return expand_case_histories_slide(spec)
+
+
+# kind -> function taking one spec and the cache directory (None when caching
+# is off) and returning the specs to build (a list or an iterator, which is
+# consumed lazily)
+EXPANDERS = {
+    "content": _expand_content,
+    "stats": _expand_stats,
+    "trend": _expand_trend,
+    "heatmap": _expand_heatmap,
+    "evidence": _expand_evidence,
+    "incidents": _expand_incidents,
+    "case_histories": _expand_case_histories,
+}
+
+
+def expand_slides(slides, cache=None):
+    """Generate the specs to build for `slides`, applying each kind's expander.
+
+    Specs an expander produces are expanded in turn, unless they are of the
+    expander's own kind. Expanders keep intermediate files (heatmap grids,
+    thumbnails) under the directory of `cache`, a `SlideCache`, and only in
+    memory without one.
+    """
+    cache_dir = cache.directory if cache is not None else None
+    for spec in slides:
+        expander = EXPANDERS.get(spec["kind"])
+        if expander is None:
+            yield spec
+            continue
+        for child in expander(spec, cache_dir):
+            if child["kind"] == spec["kind"]:
+                yield child
+            else:
+                yield from expand_slides([child], cache)
+
+
+def plan_slides(slides, cache=None):
+    """Generate `(spec, cache)` for every slide to build from `slides`, as `expand_slides()` does.
+
+    The cache is None for slides expanded from `DATA_KINDS`.
+    """
+    for spec in slides:
+        slide_cache = None if spec["kind"] in DATA_KINDS else cache
+        for child in expand_slides([spec], cache):
+            yield child, slide_cache
+
+
+def render_slide(prs, spec):
+    """Add the slide described by `spec` to `prs` using the builder for its `kind`."""
+    kwargs = {key: value for key, value in spec.items() if key not in ("id", "kind")}
+    return BUILDERS[spec["kind"]](prs, **kwargs)
+
+
+def compile_slide(spec):
+    """Return `(layout_name, xml)` for `spec` from its compiler in `COMPILERS`."""
+    kwargs = {key: value for key, value in spec.items() if key not in ("id", "kind")}
+    return COMPILERS[spec["kind"]](**kwargs)
+
+
+def _is_self_contained(slide):
+    # Slides relating to anything but their layout (pictures, charts,
+    # hyperlinks) can't be restored from their XML alone
+    return all(rel.reltype == RT.SLIDE_LAYOUT for rel in slide.part.rels.values())
+
+
+def _splice(prs, layout_name, xml, layouts=None):
+    # `layouts` memoizes get_layout(), whose lookup by name walks every layout
+    if layouts is None:
+        layout = get_layout(prs, layout_name)
+    else:
+        layout = layouts.get(layout_name)
+        if layout is None:
+            layout = layouts[layout_name] = get_layout(prs, layout_name)
+    return add_slide(prs, layout, xml)
+
+
+def render_cached(prs, spec, cache, backend="pptx", layouts=None):
+    """Add the slide for `spec`, reusing `cache` when possible; return `(slide_part, source)`.
+
+    Parts are returned rather than slides so that spliced and compiled
+    slides stay packed (see `proposal.compiled.PackedSlidePart`).
+    """
+    compiled = backend == "compiled" and spec["kind"] in COMPILERS
+    key = None
+    if cache is not None:
+        # Both backends produce the same XML, so they share cache entries
+        key = cache.key(spec, BUILDER_VERSIONS[spec["kind"]], TEMPLATE_VERSION)
+        entry = cache.get(key)
+        if entry is not None:
+            return _splice(prs, *entry, layouts), "cached"
+
+    if compiled:
+        layout_name, xml = compile_slide(spec)
+        if key is not None:
+            cache.put(key, layout_name, xml)
+        return _splice(prs, layout_name, xml, layouts), "compiled"
+
+    slide = render_slide(prs, spec)
+    if key is not None and _is_self_contained(slide):
+        xml = etree.tostring(slide._element.cSld, encoding="unicode")
+        cache.put(key, slide.slide_layout.name, xml)
+    return slide.part, "built"
+
+
+def render_slides(prs, slides, cache=None, profiler=None, backend="pptx"):
+    """Add `slides` to `prs`, building them with `backend` (one of `BACKENDS`)."""
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+    layouts = {}
+    for index, (spec, slide_cache) in enumerate(plan_slides(slides, cache)):
+        if profiler is None:
+            render_cached(prs, spec, slide_cache, backend, layouts)
+        else:
+            profiler.slide(index, spec, lambda: render_cached(prs, spec, slide_cache, backend, layouts))
+    return prs
+
+
+def build_presentation(slides, cache=None, template=None, profiler=None, backend="pptx"):
+    """Return a new Presentation holding `slides`, ready to save."""
+    prs = new_presentation(template)
+    render_slides(prs, slides, cache, profiler, backend)
+    prune_unused_layouts(prs)
+    return prs
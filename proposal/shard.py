@@ -0,0 +1,169 @@
+"""
+Split a very large deck into shards plus a short index deck.
+
+python-pptx keeps a whole package in memory until it is saved, so one deck
+holding a full incident appendix with photos needs memory in proportion to
+the deck. `build_sharded()` renders slides into a shard until it reaches
+`max_slides` slides or `max_bytes` of part data. It then saves and drops
+that shard before starting the next one. Peak memory therefore follows the
+shard size. Last, it writes an index deck listing every shard with a link to
+its file, the slides it holds and its size.
+
+Shards of `deck.pptx` are written next to it as `deck-001.pptx`,
+`deck-002.pptx`, ...; `deck.pptx` itself becomes the index.
+
+    python -m proposal --spec appendix.json --out appendix.pptx --shard-slides 500 --shard-mb 50
+"""
+
+import io
+import os
+import time
+
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+from .appendix import table_slides
+from .render import plan_slides, render_cached, render_slide
+from .templates import new_presentation, prune_unused_layouts, template_blob
+from .writer import save_deck
+
+INDEX_COLUMNS = ["File", "Slide range", "First slide", "Last slide", "Size"]
+INDEX_COLUMN_WIDTHS = [2.2, 1.4, 3.5, 3.5, 1.0]
+
+
+def shard_path(out, number):
+    """Return the path of shard `number` (from 1) of the deck saved to `out`."""
+    stem, ext = os.path.splitext(os.fspath(out))
+    return f"{stem}-{number:03d}{ext or '.pptx'}"
+
+
+def _related_bytes(part, seen):
+    # Pictures, charts and their embedded workbooks, each counted once per
+    # package (python-pptx shares identical images between slides)
+    total = 0
+    for rel in part.rels.values():
+        if rel.is_external or rel.reltype == RT.SLIDE_LAYOUT:
+            continue
+        target = rel.target_part
+        if target.partname in seen:
+            continue
+        seen.add(target.partname)
+        total += len(target.blob) + _related_bytes(target, seen)
+    return total
+
+
+def _label(spec):
+    title = str(spec.get("title", spec.get("id", spec["kind"])))
+    return " ".join(line.strip() for line in title.splitlines() if line.strip())
+
+
+def _size(size):
+    return f"{size / 1e6:.1f} MB" if size >= 1e5 else f"{size / 1e3:.0f} KB"
+
+
+class _Shard:
+    def __init__(self, template, number, first):
+        self.prs = new_presentation(io.BytesIO(template))
+        self.number = number
+        self.first = first  # deck-wide index of the shard's first slide
+        self.slides = 0
+        self.part_bytes = 0
+        self.layouts = {}
+        self._seen = set()
+        self.first_label = self.last_label = None
+
+    def add(self, index, spec, cache, backend, profiler):
+        if profiler is None:
+            slide_part, _ = render_cached(self.prs, spec, cache, backend, self.layouts)
+        else:
+            slide_part = profiler.slide(
+                index, spec, lambda: render_cached(self.prs, spec, cache, backend, self.layouts)
+            )
+        self.part_bytes += len(slide_part.blob) + _related_bytes(slide_part, self._seen)
+        self.slides += 1
+        self.last_label = _label(spec)
+        if self.first_label is None:
+            self.first_label = self.last_label
+
+    def save(self, out, profiler, save_options):
+        path = shard_path(out, self.number)
+        prune_unused_layouts(self.prs)
+        save_deck(self.prs, path, profiler=profiler, **save_options)
+        self.prs = self.layouts = self._seen = None
+        return {
+            "path": path,
+            "slides": self.slides,
+            "first": self.first + 1,
+            "last": self.first + self.slides,
+            "first_title": self.first_label,
+            "last_title": self.last_label,
+            "bytes": os.path.getsize(path),
+        }
+
+
+def build_sharded(slides, out, max_slides=None, max_bytes=None, cache=None, profiler=None, backend="pptx",
+                  index_title="Deck Index", **save_options):
+    """Render `slides` into shards next to `out` and an index deck at `out`; return the shard summaries.
+
+    A shard is closed once it holds `max_slides` slides or its parts (slide
+    XML, pictures, charts) total `max_bytes`, whichever comes first. The part
+    total is measured before compression, so files come out no larger. A
+    slide that alone exceeds `max_bytes` gets a shard of its own. Each
+    summary is a dict with the shard's `path`, `slides`, `first`/`last`
+    deck-wide slide numbers and titles, and saved `bytes`. `save_options`
+    are passed on to `proposal.writer.save_deck()`.
+    """
+    if max_slides is None and max_bytes is None:
+        raise ValueError("build_sharded() needs max_slides or max_bytes")
+    if out == "-" or hasattr(out, "write"):
+        raise ValueError("sharded decks are written to files; pass a path for out")
+
+    template = template_blob()
+    shards, shard = [], None
+    for index, (spec, slide_cache) in enumerate(plan_slides(slides, cache)):
+        if shard is None:
+            shard = _Shard(template, len(shards) + 1, index)
+        shard.add(index, spec, slide_cache, backend, profiler)
+        if (max_slides is not None and shard.slides >= max_slides) or (
+            max_bytes is not None and shard.part_bytes >= max_bytes
+        ):
+            shards.append(shard.save(out, profiler, save_options))
+            shard = None
+    if shard is not None:
+        shards.append(shard.save(out, profiler, save_options))
+
+    start = time.perf_counter()
+    prs = build_index(shards, out, index_title)
+    save_deck(prs, out, profiler=profiler, **save_options)
+    if profiler is not None:
+        profiler.span("index", "save", start, time.perf_counter(), shards=len(shards))
+    return shards
+
+
+def build_index(shards, out, title="Deck Index"):
+    """Return a Presentation summarizing `shards` (as returned by `build_sharded()`).
+
+    Each file name links to its shard, relative to the directory of `out`.
+    """
+    prs = new_presentation()
+    total = shards[-1]["last"] if shards else 0
+    size = sum(shard["bytes"] for shard in shards)
+    render_slide(prs, {
+        "kind": "title",
+        "title": title,
+        "subtitle": f"{total} slides in {len(shards)} files, {_size(size)}",
+    })
+
+    directory = os.path.dirname(os.path.abspath(out))
+    links = [os.path.relpath(os.path.abspath(shard["path"]), directory).replace(os.sep, "/") for shard in shards]
+    rows = [
+        [link, f"{shard['first']}–{shard['last']}", shard["first_title"], shard["last_title"], _size(shard["bytes"])]
+        for link, shard in zip(links, shards)
+    ]
+    links = iter(links)
+    for spec in table_slides(rows, "Files", INDEX_COLUMNS, INDEX_COLUMN_WIDTHS, total=len(rows)):
+        slide = render_slide(prs, spec)
+        table = next(shape for shape in slide.shapes if shape.has_table).table
+        for r in range(1, len(spec["rows"]) + 1):
+            table.cell(r, 0).text_frame.paragraphs[0].runs[0].hyperlink.address = next(links)
+    prune_unused_layouts(prs)
+    return prs
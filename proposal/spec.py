@@ -0,0 +1,167 @@
+"""
+Declarative deck specs.
+
+A spec is a mapping with a `slides` list. Every slide names the builder
+`kind` (see `proposal.builders.BUILDERS`) plus that builder's arguments, and
+carries a stable `id` that variants use to address individual slides:
+
+    {"slides": [
+        {"id": "problem", "kind": "content", "title": "The Problem We're Solving",
+         "content_items": [{"title": "...", "desc": "..."}]},
+        ...
+    ]}
+
+Specs are read from JSON, TOML or (when PyYAML is installed) YAML files.
+"""
+
+import copy
+import json
+import os
+
+DEFAULT_SPEC_PATH = os.path.join(os.path.dirname(__file__), "specs", "snapandsend.json")
+
+# Required and optional arguments of each builder in `proposal.builders`.
+# Kept here so specs can be validated without importing python-pptx.
+SLIDE_KINDS = {
+    "title": (("title", "subtitle"), ()),
+    "section": (("title",), ()),
+    "content": (("title", "content_items"), ("icon_text", "font_scale", "autofit")),
+    "two_column": (("title", "left_title", "left_items", "right_title", "right_items"), ()),
+    "workflow": (("title", "steps"), ()),
+    "chart": (("title", "categories", "series"), ("chart_type", "number_format", "max_points", "downsample")),
+    "table": (("title", "columns", "rows"), ("column_widths",)),
+    "image": (("title", "image"), ("caption",)),
+    "gallery": (("title", "images"), ("columns",)),
+    "timeline": (("title", "lanes"), ("span_hours",)),
+    # Expanded into chart and table slides from the live database (`proposal.datasource`)
+    "stats": ((), ("title", "database", "since")),
+    # Expanded into a chart of reports per hour or day (`proposal.datasource`)
+    "trend": ((), ("title", "database", "since", "resolution", "by", "chart_type", "max_points")),
+    # Expanded into an image slide of binned report locations (`proposal.heatmap`)
+    "heatmap": ((), ("title", "database", "bbox", "precision", "max_cells", "category", "weight")),
+    # Expanded into gallery slides of incident photos (`proposal.evidence`)
+    "evidence": ((), ("title", "database", "report_ids", "status", "limit", "per_slide", "uploads_dir")),
+    # Expanded into table slides listing every report (`proposal.appendix`)
+    "incidents": ((), ("title", "database", "since", "status", "rows_per_slide")),
+    # Expanded into timeline slides of each report's status changes (`proposal.timeline`)
+    "case_histories": ((), ("title", "database", "since", "status", "lanes_per_slide", "limit")),
+}
+
+
+class SpecError(ValueError):
+    """Raised when a deck spec does not describe a renderable deck."""
+
+
+def load_spec(path=DEFAULT_SPEC_PATH):
+    """Read the deck spec at `path`, picking the parser from its extension.
+
+    Raises SpecError for a file that can't be parsed, OSError for one that
+    can't be read.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".toml":
+        import tomllib
+        with open(path, "rb") as f:
+            try:
+                return tomllib.load(f)
+            except tomllib.TOMLDecodeError as e:
+                raise SpecError(f"{path}: {e}") from None
+    if ext in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise SpecError(f"PyYAML is required to read {path}; install it with `pip install pyyaml`") from None
+        with open(path, encoding="utf-8") as f:
+            try:
+                return yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise SpecError(f"{path}: {e}") from None
+    with open(path, encoding="utf-8") as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError as e:
+            raise SpecError(f"{path}: {e}") from None
+
+
+def validate_spec(spec):
+    """Raise SpecError listing every problem with `spec`; return `spec` otherwise."""
+    if not isinstance(spec, dict) or not isinstance(spec.get("slides"), list):
+        raise SpecError("spec must be a mapping with a `slides` list")
+
+    errors = []
+    seen_ids = set()
+    for index, slide in enumerate(spec["slides"]):
+        where = f"slide {index + 1}"
+        if not isinstance(slide, dict):
+            errors.append(f"{where}: expected a mapping, got {type(slide).__name__}")
+            continue
+        if "id" in slide:
+            where = f"{where} ({slide['id']})"
+            if slide["id"] in seen_ids:
+                errors.append(f"{where}: duplicate id")
+            seen_ids.add(slide["id"])
+
+        kind = slide.get("kind")
+        if kind not in SLIDE_KINDS:
+            errors.append(f"{where}: unknown kind {kind!r}; expected one of {', '.join(sorted(SLIDE_KINDS))}")
+            continue
+        required, optional = SLIDE_KINDS[kind]
+        for field in required:
+            if field not in slide:
+                errors.append(f"{where}: missing `{field}`")
+        for field in slide:
+            if field not in ("id", "kind") and field not in required and field not in optional:
+                errors.append(f"{where}: unexpected field `{field}` for kind {kind!r}")
+        if "since" in slide:
+            from .datasource import parse_since
+            try:
+                parse_since(slide["since"])
+            except SpecError as e:
+                errors.append(f"{where}: {e}")
+
+    if errors:
+        raise SpecError("invalid deck spec:\n  " + "\n  ".join(errors))
+    return spec
+
+
+def apply_variant(slides, variant):
+    """Return a copy of `slides` tailored to one recipient.
+
+    `variant` is a mapping with any of:
+
+    - `region`: name of the municipality or district the deck is prepared for
+    - `contact`: contact line for the closing slide
+    - `categories`: replacement items for the incident categories slide
+    - `stats`: mapping of label to value, shown on an extra slide after the
+      categories
+    """
+    slides = copy.deepcopy(slides)
+    region = variant.get("region")
+    contact = variant.get("contact", "Tech84")
+    # Slides without an id are left as they are
+    by_id = {slide["id"]: slide for slide in slides if slide.get("id") is not None}
+
+    if region and "title" in by_id:
+        by_id["title"]["subtitle"] += f"\nPrepared for {region}"
+
+    if "closing" in by_id and (region or "contact" in variant):
+        by_id["closing"]["subtitle"] = (
+            f"Contact: {contact} | Let's discuss implementation for {region or 'your region'}"
+        )
+
+    if variant.get("categories") and "categories" in by_id:
+        by_id["categories"]["content_items"] = list(variant["categories"])
+
+    if variant.get("stats"):
+        stats_slide = {
+            "id": "stats",
+            "kind": "content",
+            "title": f"{region} at a Glance" if region else "Incidents at a Glance",
+            "content_items": [
+                {"title": str(label), "desc": str(value)} for label, value in variant["stats"].items()
+            ],
+        }
+        index = slides.index(by_id["categories"]) + 1 if "categories" in by_id else len(slides) - 1
+        slides.insert(index, stats_slide)
+
+    return slides
@@ -0,0 +1,197 @@
+"""
+Local stand-in for the Express External API, for exercising `proposal.external`.
+
+Serves `GET /api/external/stats` and `GET /api/external/incidents` in the
+shapes of `server/routes/external.ts`, for synthetic partners whose keys are
+`sns_stub_0000`, `sns_stub_0001`, ... Each partner's incidents are generated
+from its key, so every run returns the same data. Connections are kept alive
+as Express does. `latency` and `fail_rate` add a per-request delay and
+random 503s to try the client's concurrency limit and retries against;
+`fail_first` answers the first that many requests for every URL and key
+with 503, with a `Retry-After` of `retry_after` seconds if given.
+
+    python -m proposal.stub_api [--port 5002] [--partners 200] [--latency 50] [--fail-rate 0.05]
+                                [--fail-first 1] [--retry-after 1] [--write-partners partners.json]
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+PREFIX = "/api/external"
+CATEGORIES = ["pothole", "garbage", "vandalism", "streetlight", "drainage", "signage", "robbery", "other"]
+STATUSES = ["pending", "investigating", "resolved"]
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def stub_partners(count):
+    """Return `count` partners (`name`, `apiKey`) served by the stub."""
+    return [{"name": f"Stub Partner {i:04d}", "apiKey": f"sns_stub_{i:04d}"} for i in range(count)]
+
+
+def _iso(moment):
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _incidents(api_key):
+    rng = random.Random(api_key)
+    incidents = []
+    for n in range(rng.randint(0, 1200)):
+        created = EPOCH + timedelta(minutes=rng.randint(0, 500_000))
+        status = rng.choice(STATUSES)
+        incidents.append({
+            "id": f"{api_key}-{n:05d}",
+            "title": f"Incident {n}",
+            "category": rng.choice(CATEGORIES),
+            "status": status,
+            "location": {"latitude": 6.45 + rng.random() / 10, "longitude": 3.39 + rng.random() / 10, "address": None},
+            "images": [],
+            "verificationCount": rng.randint(0, 12),
+            "createdAt": _iso(created),
+            "investigatingAt": _iso(created + timedelta(hours=2)) if status != "pending" else None,
+            "resolvedAt": _iso(created + timedelta(hours=30)) if status == "resolved" else None,
+        })
+    incidents.sort(key=lambda incident: incident["createdAt"], reverse=True)
+    return incidents
+
+
+class StubApi(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, partners=200, latency=0.0, fail_rate=0.0, fail_first=0, retry_after=None):
+        super().__init__(address, _Handler)
+        self.keys = {partner["apiKey"] for partner in stub_partners(partners)}
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.fail_first = fail_first
+        self.retry_after = retry_after
+        self.requests = 0
+        self.connections = 0
+        self._attempts = {}
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def should_fail(self, path, api_key):
+        """Return whether to answer this request with 503."""
+        with self._lock:
+            attempts = self._attempts[path, api_key] = self._attempts.get((path, api_key), 0) + 1
+        return attempts <= self.fail_first or (self.fail_rate and random.random() < self.fail_rate)
+
+    def incidents(self, api_key):
+        with self._lock:
+            if api_key not in self._data:
+                self._data[api_key] = _incidents(api_key)
+            return self._data[api_key]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, headers=()):
+        blob = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(blob)))
+        self.end_headers()
+        self.wfile.write(blob)
+
+    def do_GET(self):
+        server = self.server
+        with server._lock:
+            server.requests += 1
+        if server.latency:
+            time.sleep(server.latency)
+        api_key = self.headers.get("X-API-Key")
+        if server.should_fail(self.path, api_key):
+            headers = [("Retry-After", str(server.retry_after))] if server.retry_after is not None else []
+            return self._send(503, {"error": "Service unavailable", "message": "Stub failure"}, headers)
+
+        if not api_key:
+            return self._send(401, {"error": "API key required", "message": "Please provide an API key in the X-API-Key header"})
+        if api_key not in server.keys:
+            return self._send(403, {"error": "Invalid API key", "message": "The provided API key is invalid or has been deactivated"})
+
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        incidents = server.incidents(api_key)
+        if "since" in query:
+            incidents = [incident for incident in incidents if incident["createdAt"] >= query["since"]]
+        for field in ("status", "category"):
+            if field in query:
+                incidents = [incident for incident in incidents if incident[field] == query[field]]
+
+        if url.path == f"{PREFIX}/stats":
+            last24 = _iso(max((datetime.fromisoformat(i["createdAt"].replace("Z", "+00:00")) for i in incidents),
+                              default=EPOCH) - timedelta(hours=24))
+            data = {"total": len(incidents), "last24Hours": sum(i["createdAt"] >= last24 for i in incidents),
+                    "byStatus": {}, "byCategory": {}}
+            for incident in incidents:
+                data["byStatus"][incident["status"]] = data["byStatus"].get(incident["status"], 0) + 1
+                data["byCategory"][incident["category"]] = data["byCategory"].get(incident["category"], 0) + 1
+            return self._send(200, {"success": True, "data": data})
+        if url.path == f"{PREFIX}/incidents":
+            take = min(int(query.get("limit", 50)), 500)
+            skip = int(query.get("offset", 0))
+            return self._send(200, {
+                "success": True,
+                "data": incidents[skip:skip + take],
+                "pagination": {"total": len(incidents), "limit": take, "offset": skip, "hasMore": skip + take < len(incidents)},
+            })
+        return self._send(404, {"error": "Not found", "message": "Resource not found"})
+
+
+def serve(port=0, partners=200, latency=0.0, fail_rate=0.0, fail_first=0, retry_after=None):
+    """Start a stub server on a background thread; return it (`server.server_address` has the port).
+
+    `latency` is in seconds.
+    """
+    server = StubApi(("127.0.0.1", port), partners, latency, fail_rate, fail_first, retry_after)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a stub of the SnapAndSend External API.")
+    parser.add_argument("--port", type=int, default=5002, help="port to listen on (default: %(default)s)")
+    parser.add_argument("--partners", type=int, default=200, help="number of synthetic partners (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.0, help="milliseconds added to every response")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--fail-first", type=int, default=0, help="answer the first N requests per URL and key with 503")
+    parser.add_argument("--retry-after", type=int, help="Retry-After seconds sent with 503s")
+    parser.add_argument("--write-partners", metavar="FILE", help="write the partner list for proposal.external --partners")
+    args = parser.parse_args(argv)
+
+    if args.write_partners:
+        with open(args.write_partners, "w", encoding="utf-8") as f:
+            json.dump(stub_partners(args.partners), f, indent=2)
+    server = StubApi(("127.0.0.1", args.port), args.partners, args.latency / 1000, args.fail_rate, args.fail_first,
+                     args.retry_after)
+    print(f"Stub External API on http://127.0.0.1:{args.port}{PREFIX} ({args.partners} partners)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"{server.requests} requests over {server.connections} connections", file=sys.stderr)
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
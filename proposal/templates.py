@@ -0,0 +1,161 @@
+"""
+Custom slide layouts carrying the chrome shared by every slide of a kind.
+
+Background, header bar, accent bars and footer live on a layout that is built
+once per Presentation the first time a slide of that kind is added; slides
+then only carry their own content and inherit the rest from the layout.
+"""
+
+import copy
+import io
+
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.enum.text import PP_ALIGN
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.parts.slide import SlideLayoutPart
+from pptx.shapes.shapetree import SlideShapes
+from pptx.util import Inches, Pt
+
+from .theme import DARK_GREEN, LIGHT_GRAY, LIGHT_GREEN, PRIMARY_GREEN
+
+SLIDE_WIDTH = Inches(13.333)
+SLIDE_HEIGHT = Inches(7.5)
+
+# Bump whenever the chrome drawn on a layout changes
+TEMPLATE_VERSION = 1
+
+TITLE_LAYOUT = "SnapAndSend Title"
+SECTION_LAYOUT = "SnapAndSend Section"
+CONTENT_LAYOUT = "SnapAndSend Content"
+
+
+def new_presentation(template=None):
+    """Return an empty 16:9 Presentation, optionally from a template file or stream."""
+    prs = Presentation(template)
+    prs.slide_width = SLIDE_WIDTH
+    prs.slide_height = SLIDE_HEIGHT
+    return prs
+
+
+def template_blob():
+    """Return a serialized presentation with every template layout pre-built.
+
+    Loading this blob is cheaper than building the layouts again, so callers
+    rendering many decks in one process build it once and pass
+    `io.BytesIO(blob)` to `new_presentation()` for each deck.
+    """
+    prs = new_presentation()
+    for name in TEMPLATES:
+        get_layout(prs, name)
+    prune_unused_layouts(prs, keep=TEMPLATES)
+    stream = io.BytesIO()
+    prs.save(stream)
+    return stream.getvalue()
+
+
+def _add_rectangle(shapes, left, top, width, height, color):
+    shape = shapes.add_shape(MSO_SHAPE.RECTANGLE, left, top, width, height)
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = color
+    shape.line.fill.background()
+    return shape
+
+
+def _add_footer(shapes, left, top, width, height, text, size, color, alignment):
+    footer_box = shapes.add_textbox(left, top, width, height)
+    p = footer_box.text_frame.paragraphs[0]
+    p.text = text
+    p.font.size = Pt(size)
+    p.font.color.rgb = color
+    p.alignment = alignment
+    return footer_box
+
+
+def _draw_title_chrome(prs, shapes):
+    # Background shape
+    _add_rectangle(shapes, 0, 0, prs.slide_width, prs.slide_height, DARK_GREEN)
+    # Accent bar
+    _add_rectangle(shapes, 0, Inches(3.2), prs.slide_width, Inches(0.1), PRIMARY_GREEN)
+    # Footer
+    _add_footer(shapes, Inches(0.5), Inches(6.8), Inches(12.333), Inches(0.5),
+                "© Tech84 | Community Incident Reporting Platform", 14, LIGHT_GREEN, PP_ALIGN.CENTER)
+
+
+def _draw_section_chrome(prs, shapes):
+    # Left accent bar
+    _add_rectangle(shapes, 0, 0, Inches(0.3), prs.slide_height, PRIMARY_GREEN)
+
+
+def _draw_content_chrome(prs, shapes):
+    # Header bar
+    _add_rectangle(shapes, 0, 0, prs.slide_width, Inches(1.2), DARK_GREEN)
+    # Footer
+    _add_footer(shapes, Inches(11.5), Inches(7), Inches(1.5), Inches(0.4),
+                "© Tech84", 10, LIGHT_GRAY, PP_ALIGN.RIGHT)
+
+
+TEMPLATES = {
+    TITLE_LAYOUT: _draw_title_chrome,
+    SECTION_LAYOUT: _draw_section_chrome,
+    CONTENT_LAYOUT: _draw_content_chrome,
+}
+
+
+def get_layout(prs, name):
+    """Return the template layout `name` of `prs`, creating it on first use."""
+    layout = prs.slide_layouts.get_by_name(name)
+    if layout is None:
+        layout = _create_layout(prs, name)
+    return layout
+
+
+def _create_layout(prs, name):
+    master = prs.slide_master
+    package = prs.part.package
+
+    # Start from a copy of an existing layout, minus its shapes
+    element = copy.deepcopy(prs.slide_layouts[0]._element)
+    element.cSld.set("name", name)
+    for attr in ("type", "preserve", "userDrawn"):
+        element.attrib.pop(attr, None)
+    sp_tree = element.cSld.spTree
+    for shape in list(sp_tree.iter_shape_elms()):
+        sp_tree.remove(shape)
+
+    partname = package.next_partname("/ppt/slideLayouts/slideLayout%d.xml")
+    layout_part = SlideLayoutPart(partname, CT.PML_SLIDE_LAYOUT, package, element)
+    layout_part.relate_to(master.part, RT.SLIDE_MASTER)
+    rId = master.part.relate_to(layout_part, RT.SLIDE_LAYOUT)
+
+    # Layout ids share a number space with the master id and must be unique
+    id_lst = master._element.get_or_add_sldLayoutIdLst()
+    next_id = max(int(entry.get("id")) for entry in id_lst.sldLayoutId_lst) + 1
+    entry = id_lst._add_sldLayoutId()
+    entry.set("id", str(next_id))
+    entry.rId = rId
+
+    layout = layout_part.slide_layout
+    TEMPLATES[name](prs, SlideShapes(sp_tree, layout))
+    return layout
+
+
+def prune_unused_layouts(prs, keep=()):
+    """Drop layouts no slide uses so they are not written to the package.
+
+    Layouts named in `keep` survive even when unused.
+    """
+    # One pass over the slides: `layout.used_by_slides` (also checked by
+    # `slide_layouts.remove()`) walks every slide again for each layout
+    used = {
+        rel.target_part.part_related_by(RT.SLIDE_LAYOUT)
+        for rel in prs.part.rels.values() if rel.reltype == RT.SLIDE
+    }
+    master_part = prs.slide_master.part
+    id_lst = prs.slide_master._element.get_or_add_sldLayoutIdLst()
+    for entry in list(id_lst.sldLayoutId_lst):
+        layout_part = master_part.related_part(entry.rId)
+        if layout_part in used or layout_part.slide_layout.name in keep:
+            continue
+        id_lst.remove(entry)
+        master_part.drop_rel(entry.rId)
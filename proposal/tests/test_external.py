@@ -0,0 +1,80 @@
+"""Tests for `proposal.external` against the local `proposal.stub_api` server."""
+
+import asyncio
+import time
+
+import pytest
+
+from proposal.external import ExternalApiClient, ExternalApiError, ResponseCache, fetch_partners
+from proposal.stub_api import PREFIX, serve, stub_partners
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(**options):
+        server = serve(0, partners=6, **options)
+        servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_address[1]}{PREFIX}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_connections_bounded_by_concurrency(stub):
+    server, base_url = stub(latency=0.02)
+    partners = stub_partners(6)
+
+    async def fetch():
+        async with ExternalApiClient(base_url, concurrency=3) as client:
+            await asyncio.gather(*(client.incidents(partner["apiKey"]) for partner in partners))
+            return client
+
+    client = asyncio.run(fetch())
+    assert client.requests > 3
+    assert client.connections_opened <= 3
+    assert server.connections <= 3
+
+
+def test_retries_recover_from_503_and_honour_retry_after(stub):
+    server, base_url = stub(fail_first=1, retry_after=1)
+    partners = stub_partners(3)
+
+    start = time.perf_counter()
+    results = fetch_partners(partners, base_url, concurrency=4, retries=2, backoff=0.01)
+    elapsed = time.perf_counter() - start
+
+    assert not any(isinstance(result, ExternalApiError) for result in results.values())
+    for partner in partners:
+        assert results[partner["name"]]["stats"]["total"] == len(results[partner["name"]]["incidents"])
+    assert elapsed >= 1
+
+
+def test_cached_rerun_makes_no_requests(stub, tmp_path):
+    server, base_url = stub()
+    partners = stub_partners(4)
+    cache = ResponseCache(str(tmp_path), ttl=60)
+
+    first = fetch_partners(partners, base_url, cache=cache)
+    requests = server.requests
+    assert requests > 0
+
+    second = fetch_partners(partners, base_url, cache=cache)
+    assert server.requests == requests
+    assert second == first
+
+
+def test_bad_key_fails_only_its_partner(stub):
+    server, base_url = stub()
+    partners = stub_partners(3) + [{"name": "Revoked", "apiKey": "sns_revoked"}]
+
+    results = fetch_partners(partners, base_url, retries=0)
+
+    error = results["Revoked"]
+    assert isinstance(error, ExternalApiError)
+    assert error.status == 403
+    for partner in partners[:3]:
+        assert set(results[partner["name"]]) == {"stats", "incidents"}
@@ -0,0 +1,244 @@
+"""
+Text measurement and fitting without a rendering pass.
+
+Widths come from per-character advance tables. The built-in table holds
+approximate Calibri advances (the default theme font of python-pptx's
+template), and `register_font()` can load exact advances from a TrueType
+file through Pillow. Scaled tables are memoized per font, weight and size,
+and measured words in a bounded LRU cache, so laying out thousands of
+bullets costs dictionary lookups rather than a layout engine.
+
+Line height follows PowerPoint's single spacing of 1.2 x the font size.
+"""
+
+import unicodedata
+from functools import lru_cache
+
+from pptx.util import Inches, Pt
+
+LINE_SPACING = 1.2
+
+# Default text frame insets of a python-pptx textbox
+INSET_X = Inches(0.1)
+INSET_Y = Inches(0.05)
+
+_ASCII_FROM = 32
+# Calibri advance widths for ASCII 32-126, in 1/2048 em
+_CALIBRI = (
+    463, 546, 714, 1038, 1038, 1470, 1397, 452, 621, 621, 1038, 1038, 511, 627, 517, 791,
+    1038, 1038, 1038, 1038, 1038, 1038, 1038, 1038, 1038, 1038,
+    548, 548, 1038, 1038, 1038, 949, 1823,
+    1185, 1114, 1092, 1260, 1000, 941, 1292, 1276, 516, 653, 1064, 861, 1751,
+    1322, 1356, 1058, 1378, 1112, 941, 998, 1314, 1162, 1822, 1063, 998, 959,
+    628, 791, 628, 1038, 1038, 588,
+    981, 1076, 866, 1076, 1019, 625, 964, 1076, 470, 490, 931, 470, 1636,
+    1076, 1080, 1076, 1076, 714, 801, 686, 1076, 925, 1464, 887, 927, 809,
+    714, 941, 714, 1038,
+)
+_CALIBRI_EXTRA = {"•": 1010, "–": 1024, "—": 2048, "→": 2048, "©": 1636, "…": 1434, "’": 452, "“": 714, "”": 714}
+_UNITS_PER_EM = 2048
+_AVERAGE = 1000
+# Bold Calibri runs about 4% wider than regular
+_BOLD_FACTOR = 1.04
+# Word widths kept across fonts and sizes
+WORD_CACHE_SIZE = 65536
+
+_BUILTIN_FONTS = {"Calibri": ({chr(_ASCII_FROM + i): w for i, w in enumerate(_CALIBRI)} | _CALIBRI_EXTRA)}
+_registered = {}
+
+
+def register_font(name, path, bold_path=None):
+    """Measure `name` from TrueType files instead of the built-in approximation."""
+    from PIL import ImageFont
+
+    def advances(font_path):
+        font = ImageFont.truetype(font_path, _UNITS_PER_EM)
+        chars = [chr(c) for c in range(_ASCII_FROM, 127)] + list(_CALIBRI_EXTRA)
+        return {char: font.getlength(char) for char in chars}
+
+    _registered[(name, False)] = advances(path)
+    _registered[(name, True)] = advances(bold_path) if bold_path else None
+    _scaled_widths.cache_clear()
+    _word_width.cache_clear()
+
+
+def _advances(font, bold):
+    if (font, bold) in _registered and _registered[(font, bold)] is not None:
+        return _registered[(font, bold)], 1.0
+    if (font, False) in _registered:
+        return _registered[(font, False)], _BOLD_FACTOR if bold else 1.0
+    return _BUILTIN_FONTS["Calibri"], _BOLD_FACTOR if bold else 1.0
+
+
+@lru_cache(maxsize=256)
+def _scaled_widths(font, bold, size_pt):
+    """Return the character widths in EMU for one font, weight and size."""
+    advances, factor = _advances(font, bold)
+    scale = Pt(size_pt) * factor / _UNITS_PER_EM
+    return {char: width * scale for char, width in advances.items()}
+
+
+def _char_width(char, widths, size_pt):
+    width = widths.get(char)
+    if width is None:
+        # Accented letters measure like their base letter
+        base = unicodedata.normalize("NFKD", char)[:1]
+        width = widths.get(base, Pt(size_pt) * _AVERAGE / _UNITS_PER_EM)
+        widths[char] = width
+    return width
+
+
+def text_width(text, size_pt, bold=False, font="Calibri"):
+    """Return the width of single-line `text` in EMU."""
+    return _word_width(text, size_pt, bold, font)
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def _word_width(text, size_pt, bold, font):
+    widths = _scaled_widths(font, bold, size_pt)
+    return sum(_char_width(char, widths, size_pt) for char in text)
+
+
+def count_lines(text, width, size_pt, bold=False, font="Calibri", wrap=True):
+    """Return how many lines `text` occupies in a frame `width` EMU wide.
+
+    Explicit newlines always break; with `wrap`, words that don't fit move
+    to the next line and words wider than the frame break mid-word.
+    """
+    space = text_width(" ", size_pt, bold, font)
+    lines = 0
+    for paragraph in str(text).split("\n"):
+        lines += 1
+        if not wrap:
+            continue
+        used = 0
+        for word in paragraph.split(" "):
+            word_width = text_width(word, size_pt, bold, font)
+            if used and used + space + word_width > width:
+                lines += 1
+                used = 0
+            elif used:
+                used += space
+            if word_width > width:
+                full, rest = divmod(word_width, width)
+                lines += int(full)
+                used = rest
+            else:
+                used += word_width
+    return lines
+
+
+def widest_line(text, size_pt, bold=False, font="Calibri"):
+    return max(text_width(line, size_pt, bold, font) for line in str(text).split("\n"))
+
+
+def text_height(text, width, size_pt, bold=False, font="Calibri", wrap=True):
+    """Return the height of `text` laid out in a frame `width` EMU wide."""
+    return count_lines(text, width, size_pt, bold, font, wrap) * Pt(size_pt) * LINE_SPACING
+
+
+def fit_font_size(texts, width, height, max_size, min_size, bold=False, wrap=True, step=0.5):
+    """Return the largest size in [min_size, max_size] at which every text fits the frame.
+
+    The frame is given by its outer `width` and `height` in EMU; the default
+    textbox insets are subtracted. Returns `min_size` if nothing fits.
+    """
+    inner_width = width - 2 * INSET_X
+    inner_height = height - 2 * INSET_Y
+    size = max_size
+    while size > min_size:
+        fits = all(
+            text_height(text, inner_width, size, bold, wrap=wrap) <= inner_height
+            and (wrap or widest_line(text, size, bold) <= inner_width)
+            for text in texts
+        )
+        if fits:
+            return size
+        size -= step
+    return min_size
+
+
+# ----- Content slides -----
+
+CONTENT_WIDTH = Inches(12.333)
+CONTENT_HEIGHT = Inches(5.5)
+MIN_CONTENT_SCALE = 0.75
+
+# (size, bold, space_after) in points at scale 1.0, matching add_content_slide()
+CONTENT_ITEM_TITLE = (22, True, 4)
+CONTENT_ITEM_DESC = (18, False, 16)
+CONTENT_BULLET = (20, False, 12)
+
+
+def scaled_size(size, scale):
+    """Scale a point size, rounding to the half point PowerPoint displays."""
+    return round(size * scale * 2) / 2
+
+
+def _paragraphs(item):
+    if isinstance(item, dict):
+        yield f"• {item['title']}", CONTENT_ITEM_TITLE
+        if "desc" in item:
+            yield f"   {item['desc']}", CONTENT_ITEM_DESC
+    else:
+        yield f"• {item}", CONTENT_BULLET
+
+
+def content_item_height(item, scale=1.0, width=CONTENT_WIDTH):
+    """Return the height in EMU that `item` takes up on a content slide at `scale`."""
+    inner_width = width - 2 * INSET_X
+    height = 0
+    for text, (size, bold, space_after) in _paragraphs(item):
+        size = scaled_size(size, scale)
+        height += text_height(text, inner_width, size, bold) + Pt(scaled_size(space_after, scale))
+    return height
+
+
+def fit_content_items(items, width=CONTENT_WIDTH, height=CONTENT_HEIGHT, min_scale=MIN_CONTENT_SCALE):
+    """Lay out content items, shrinking and then splitting them to fit.
+
+    Returns a list of `(items, scale)` pages: a single page at the largest
+    scale down to `min_scale` that fits, or, when even `min_scale` overflows,
+    as many pages at full size as needed.
+    """
+    inner_height = height - 2 * INSET_Y
+    scale = 1.0
+    while scale >= min_scale - 1e-9:
+        if sum(content_item_height(item, scale, width) for item in items) <= inner_height:
+            return [(list(items), scale)]
+        scale = round(scale - 0.05, 2)
+
+    pages, page, used = [], [], 0
+    for item in items:
+        item_height = content_item_height(item, 1.0, width)
+        if page and used + item_height > inner_height:
+            pages.append((page, 1.0))
+            page, used = [], 0
+        page.append(item)
+        used += item_height
+    if page:
+        pages.append((page, 1.0))
+    return pages
+
+
+def fit_content_slide(spec):
+    """Expand one content slide spec into the spec(s) that fit on slides."""
+    if not spec.get("autofit", True):
+        return [{key: value for key, value in spec.items() if key != "autofit"}]
+
+    spec = {key: value for key, value in spec.items() if key != "autofit"}
+    pages = fit_content_items(spec["content_items"])
+    if len(pages) == 1 and pages[0][1] == 1.0:
+        return [spec]
+
+    expanded = []
+    for number, (items, scale) in enumerate(pages, start=1):
+        page = dict(spec, content_items=items)
+        if scale != 1.0:
+            page["font_scale"] = scale
+        if number > 1:
+            page["title"] = f"{spec['title']} (cont.)"
+            if "id" in spec:
+                page["id"] = f"{spec['id']}-{number}"
+        expanded.append(page)
+    return expanded
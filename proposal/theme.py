@@ -0,0 +1,24 @@
+"""Colour scheme shared by every SnapAndSend deck."""
+
+from pptx.dml.color import RGBColor
+
+PRIMARY_GREEN = RGBColor(16, 185, 129)  # Emerald-500
+DARK_GREEN = RGBColor(6, 95, 70)        # Emerald-800
+LIGHT_GREEN = RGBColor(209, 250, 229)   # Emerald-100
+DARK_GRAY = RGBColor(31, 41, 55)        # Gray-800
+LIGHT_GRAY = RGBColor(107, 114, 128)    # Gray-500
+WHITE = RGBColor(255, 255, 255)
+BLUE = RGBColor(59, 130, 246)           # Blue-500
+LIGHT_BLUE = RGBColor(219, 234, 254)    # Blue-100
+DARK_BLUE = RGBColor(30, 64, 175)       # Blue-800
+AMBER = RGBColor(245, 158, 11)          # Amber-500
+RED = RGBColor(239, 68, 68)             # Red-500
+VIOLET = RGBColor(139, 92, 246)         # Violet-500
+GRIDLINE = RGBColor(229, 231, 235)      # Gray-200
+PANEL_GRAY = RGBColor(249, 250, 251)    # Gray-50
+
+# Workflow steps and chart series, in turn
+ACCENT_COLORS = (PRIMARY_GREEN, BLUE, AMBER, RED, VIOLET)
+
+# Incident statuses (see `Report.status`)
+STATUS_COLORS = {"pending": AMBER, "investigating": BLUE, "resolved": PRIMARY_GREEN}
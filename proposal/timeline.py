@@ -0,0 +1,240 @@
+"""
+Resolution timelines: per-incident status histories as swimlanes.
+
+A `timeline` slide has one lane per incident. Each lane has a marker for
+every status change, placed in proportion to the time since the report was
+made, on an axis shared by the lanes of that slide. Lanes carry as many
+events as their history has, and markers are coloured by status rather
+than by position, so nothing depends on the number of steps.
+`timeline_shapes()` lays a slide out as a list of drawing operations; the
+builder (`proposal.builders`) and the compiled backend (`proposal.compiled`)
+both draw from it, which keeps the two identical.
+
+A `case_histories` spec expands into as many timeline slides as there are
+matching incidents. `StatusLog` rows are streamed from one cursor joined
+to their reports, and grouped into incidents in chunks. Each chunk's
+elapsed times, lane lengths and per-slide axis spans are computed in one
+NumPy pass, so only one chunk of histories is ever held in memory.
+
+Requires NumPy for `case_histories`.
+"""
+
+from contextlib import closing
+from itertools import groupby, islice
+
+from pptx.enum.text import PP_ALIGN
+from pptx.util import Inches
+
+from .datasource import MS_PER_HOUR, connect, epoch_ms, parse_since
+from .theme import DARK_GRAY, GRIDLINE, LIGHT_GRAY, STATUS_COLORS
+
+LANES_PER_SLIDE = 8
+# Incidents laid out per NumPy pass
+CHUNK_SLIDES = 64
+
+LABEL_LEFT = Inches(0.5)
+LABEL_WIDTH = Inches(2.6)
+TRACK_LEFT = Inches(3.4)
+TRACK_WIDTH = Inches(9.2)
+AXIS_TOP = Inches(1.35)
+LANES_TOP = Inches(1.8)
+LANES_HEIGHT = Inches(4.8)
+LEGEND_TOP = Inches(6.75)
+MARKER = Inches(0.16)
+TRACK_HEIGHT = Inches(0.04)
+GRIDLINE_WIDTH = Inches(0.01)
+EVENT_LABEL_WIDTH = Inches(1.2)
+# Closer markers than this share the earlier one's label
+EVENT_LABEL_GAP = Inches(1.1)
+AXIS_TICKS = 4
+
+# Axis spans in hours, so that quarter ticks land on round durations
+NICE_SPANS = (1, 2, 4, 6, 12, 24, 48, 96, 168, 336, 720, 1440, 2160, 4320, 8760)
+
+
+def nice_span(hours):
+    """Return the smallest of `NICE_SPANS` (or whole years) covering `hours`."""
+    for span in NICE_SPANS:
+        if hours <= span:
+            return span
+    return NICE_SPANS[-1] * -(-hours // NICE_SPANS[-1])
+
+
+def duration(hours):
+    """Format a duration in hours as minutes, hours or days."""
+    if hours <= 0:
+        return "0"
+    if hours < 1:
+        return f"{hours * 60:.0f} min"
+    if hours < 48:
+        return f"{hours:.3g} h"
+    return f"{hours / 24:.3g} d"
+
+
+def timeline_shapes(lanes, span_hours=None):
+    """Return the shapes of a timeline slide below its title as drawing operations.
+
+    `lanes` is a list of `{"label", "events"}`, with events as `{"at"
+    (hours since the lane started), "status", "by"?}` in time order. The
+    axis covers `span_hours`, by default the longest lane rounded up with
+    `nice_span()`. Operations are `("rect" | "oval", left, top, width,
+    height, color)` and `("text", left, top, width, height, text, size,
+    color, align)`.
+    """
+    if span_hours is None:
+        span_hours = nice_span(max((event["at"] for lane in lanes for event in lane["events"]), default=1) or 1)
+    lane_height = LANES_HEIGHT / max(len(lanes), LANES_PER_SLIDE)
+    lanes_bottom = LANES_TOP + lane_height * len(lanes)
+
+    def x(at):
+        return TRACK_LEFT + TRACK_WIDTH * min(max(at / span_hours, 0), 1)
+
+    ops = []
+    for tick in range(AXIS_TICKS + 1):
+        tick_x = x(span_hours * tick / AXIS_TICKS)
+        ops.append(("rect", tick_x, LANES_TOP, GRIDLINE_WIDTH, lanes_bottom - LANES_TOP, GRIDLINE))
+        ops.append(("text", tick_x - Inches(0.6), AXIS_TOP, Inches(1.2), Inches(0.3),
+                    duration(span_hours * tick / AXIS_TICKS), 10, LIGHT_GRAY, PP_ALIGN.CENTER))
+
+    for i, lane in enumerate(lanes):
+        top = LANES_TOP + lane_height * i
+        center = top + lane_height * 0.35
+        ops.append(("text", LABEL_LEFT, top, LABEL_WIDTH, lane_height * 0.8, lane["label"], 10, DARK_GRAY, None))
+        events = lane["events"]
+        if not events:
+            continue
+        start, end = x(events[0]["at"]), x(events[-1]["at"])
+        ops.append(("rect", start, center - TRACK_HEIGHT / 2, end - start, TRACK_HEIGHT, LIGHT_GRAY))
+        labelled = None
+        for event in events:
+            event_x = x(event["at"])
+            color = STATUS_COLORS.get(event["status"], LIGHT_GRAY)
+            ops.append(("oval", event_x - MARKER / 2, center - MARKER / 2, MARKER, MARKER, color))
+            if labelled is None or event_x - labelled >= EVENT_LABEL_GAP:
+                labelled = event_x
+                text = f"{event['status']}\n{event['by']}" if event.get("by") else event["status"]
+                ops.append(("text", event_x - EVENT_LABEL_WIDTH / 2, center + MARKER / 2, EVENT_LABEL_WIDTH,
+                            Inches(0.35), text, 8, LIGHT_GRAY, PP_ALIGN.CENTER))
+
+    legend_x = TRACK_LEFT
+    for status in ("pending", "investigating", "resolved"):
+        ops.append(("oval", legend_x, LEGEND_TOP + Inches(0.07), MARKER, MARKER, STATUS_COLORS[status]))
+        ops.append(("text", legend_x + Inches(0.2), LEGEND_TOP, Inches(1.6), Inches(0.3), status, 10, DARK_GRAY, None))
+        legend_x += Inches(1.8)
+    return ops
+
+
+def _where(since, status):
+    clauses, params = [], []
+    if since is not None:
+        clauses.append(f"{epoch_ms('r.createdAt')} >= ?")
+        params.append(since.timestamp() * 1000)
+    if status is not None:
+        clauses.append("r.status = ?")
+        params.append(status)
+    return (f" WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+def count_histories(path=None, since=None, status="resolved", limit=None):
+    """Return how many reports `iter_histories()` yields for the same arguments."""
+    where, params = _where(since, status)
+    with closing(connect(path)) as conn:
+        count = conn.execute(
+            f"SELECT COUNT(DISTINCT r.id) FROM Report r JOIN StatusLog l ON l.reportId = r.id{where}", params
+        ).fetchone()[0]
+    return count if limit is None else min(count, limit)
+
+
+def iter_histories(path=None, since=None, status="resolved", limit=None):
+    """Yield `(report_id, category, created_ms, [(new_status, changed_by, at_ms), ...])` per report.
+
+    Reports come oldest first, each with its `StatusLog` rows in time order,
+    straight off one joined cursor.
+    """
+    where, params = _where(since, status)
+    with closing(connect(path)) as conn:
+        cursor = conn.execute(
+            f"SELECT r.id, r.category, {epoch_ms('r.createdAt')}, l.newStatus, l.changedBy, {epoch_ms('l.createdAt')} "
+            f"FROM Report r JOIN StatusLog l ON l.reportId = r.id{where} "
+            f"ORDER BY {epoch_ms('r.createdAt')}, r.id, {epoch_ms('l.createdAt')}",
+            params,
+        )
+        histories = groupby(cursor, key=lambda row: row[:3])
+        for (report_id, category, created), rows in islice(histories, limit):
+            yield report_id, category, created, [(new, by, at) for _, _, _, new, by, at in rows]
+
+
+def _layout_chunk(np, histories, lanes_per_slide):
+    # One pass over every event of the chunk: elapsed hours, each lane's
+    # length and each slide's axis span
+    counts = np.array([len(events) + 1 for *_, events in histories])
+    created = np.repeat(np.array([created for _, _, created, _ in histories], dtype=float), counts)
+    at = np.fromiter(
+        (at for _, _, created, events in histories for at in (created, *(at for _, _, at in events))),
+        dtype=float, count=int(counts.sum()),
+    )
+    elapsed = (at - created) / MS_PER_HOUR
+    lane_starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    lane_length = np.maximum.reduceat(elapsed, lane_starts)
+    slide_span = np.maximum.reduceat(lane_length, np.arange(0, len(histories), lanes_per_slide))
+    nice = np.array(NICE_SPANS, dtype=float)
+    spans = np.where(
+        slide_span <= nice[-1],
+        nice[np.minimum(np.searchsorted(nice, slide_span), len(nice) - 1)],
+        np.ceil(slide_span / nice[-1]) * nice[-1],
+    )
+    spans = np.where(slide_span > 0, spans, 1.0)
+    return elapsed.tolist(), lane_starts.tolist(), lane_length.tolist(), spans.tolist()
+
+
+def timeline_slides(histories, title="Resolution Timelines", lanes_per_slide=LANES_PER_SLIDE, total=None,
+                    slide_id=None):
+    """Yield `timeline` slide specs laying out the iterable `histories` (see `iter_histories()`).
+
+    With `total` (the number of histories), titles are numbered "page/pages".
+    """
+    import numpy as np
+
+    pages = -(-total // lanes_per_slide) if total else None
+    number = 0
+    histories = iter(histories)
+    while True:
+        chunk = list(islice(histories, lanes_per_slide * CHUNK_SLIDES))
+        if not chunk:
+            return
+        elapsed, lane_starts, lane_length, spans = _layout_chunk(np, chunk, lanes_per_slide)
+        for first in range(0, len(chunk), lanes_per_slide):
+            lanes = []
+            for lane in range(first, min(first + lanes_per_slide, len(chunk))):
+                report_id, category, _, events = chunk[lane]
+                offset = lane_starts[lane]
+                lanes.append({
+                    "label": f"{report_id}\n{category} · {duration(lane_length[lane])}",
+                    "events": [{"at": elapsed[offset], "status": "pending"}] + [
+                        {"at": elapsed[offset + 1 + k], "status": new, "by": by}
+                        for k, (new, by, _) in enumerate(events)
+                    ],
+                })
+            number += 1
+            spec = {
+                "kind": "timeline",
+                "title": f"{title} ({number}/{pages})" if pages else f"{title} ({number})",
+                "lanes": lanes,
+                "span_hours": spans[first // lanes_per_slide],
+            }
+            if slide_id:
+                spec["id"] = f"{slide_id}-{number}"
+            yield spec
+
+
+def expand_case_histories_slide(spec):
+    """Lazily expand a `case_histories` spec into timeline slides, one lane per matching incident."""
+    since = parse_since(spec.get("since"))
+    path, status, limit = spec.get("database"), spec.get("status", "resolved"), spec.get("limit")
+    yield from timeline_slides(
+        iter_histories(path, since, status, limit),
+        spec.get("title", "Resolution Timelines"),
+        spec.get("lanes_per_slide", LANES_PER_SLIDE),
+        total=count_histories(path, since, status, limit),
+        slide_id=spec.get("id"),
+    )
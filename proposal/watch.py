@@ -0,0 +1,227 @@
+"""
+Watch mode: rebuild a deck whenever its spec or inputs change.
+
+    python -m proposal --spec deck.json --out deck.pptx --watch [--backend compiled]
+
+renders the deck once, then polls the spec and every file its slides read
+(pictures, and the database of data-driven slides) and rebuilds on change.
+The Presentation, its layouts and everything imported stay warm in one
+`DeckSession` between rebuilds:
+
+- a slide whose spec and inputs are unchanged keeps its slide part, so an
+  edit only goes through the builders for the slides it touched;
+- moving or deleting slides only rewrites the slide list;
+- data-driven specs (`stats`, `incidents`, ...) are expanded again only when
+  the spec itself or its database changes.
+
+Each rebuild is saved to a temporary file next to the output and renamed
+over it, so a viewer never opens a half-written deck. A spec that fails to
+load or render is reported and the last good deck is left in place.
+"""
+
+import json
+import os
+import sys
+import time
+
+from .builders import BUILDER_VERSIONS
+from .cache import slide_key
+from .render import BACKENDS, DATA_KINDS, expand_slides, render_cached
+from .spec import load_spec, validate_spec
+from .templates import TEMPLATE_VERSION, new_presentation, prune_unused_layouts
+from .writer import save_deck
+
+POLL_INTERVAL = 0.25  # seconds
+
+
+def input_files(spec):
+    """Return the files the slides expanded from `spec` read, besides the spec itself."""
+    kind = spec["kind"]
+    if kind == "image":
+        images = [spec["image"]]
+    elif kind == "gallery":
+        images = [item.get("image") for item in spec["images"]]
+    else:
+        images = []
+    files = [image for image in images if isinstance(image, (str, os.PathLike))]
+    if kind in DATA_KINDS:
+        # SQLite may hold recent writes in its WAL
+        from .datasource import resolve_database
+
+        database = resolve_database(spec.get("database"))
+        files += [database, f"{database}-wal"]
+    if kind == "evidence":
+        from .evidence import UPLOADS_DIR
+
+        files.append(spec.get("uploads_dir", UPLOADS_DIR))
+    return files
+
+
+def _stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _stamps(paths):
+    return {os.fspath(path): _stamp(path) for path in paths}
+
+
+class DeckSession:
+    """A Presentation kept in memory and updated in place from successive specs.
+
+    `update()` brings the deck in line with a new slide list, building only
+    the slides it hasn't built before; `save()` writes it atomically.
+    """
+
+    def __init__(self, cache=None, backend="pptx", template=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+        self.prs = new_presentation(template)
+        self.cache = cache
+        self.backend = backend
+        # [(section key, input stamps, [(slide key, slide part), ...])] per
+        # top-level spec, in deck order
+        self._sections = []
+
+    @property
+    def inputs(self):
+        """Every file the current slides were built from."""
+        return [path for _, stamps, _ in self._sections for path in json.loads(stamps)]
+
+    def update(self, slides):
+        """Rebuild the deck as `slides`; return `(built, reused)` slide counts.
+
+        If a slide fails to build, the deck is left as it was and the error
+        propagates.
+        """
+        previous = {}
+        for section in self._sections:
+            previous.setdefault(section[0], []).append(section)
+
+        # Sections whose spec and inputs are unchanged keep their slides
+        sections, pending = [], []
+        for spec in slides:
+            stamps = json.dumps(_stamps(input_files(spec)), sort_keys=True)
+            key = slide_key(spec, [BUILDER_VERSIONS.get(spec["kind"]), stamps], TEMPLATE_VERSION)
+            matches = previous.get(key)
+            if matches:
+                sections.append(matches.pop())
+            else:
+                pending.append((len(sections), key, stamps, spec))
+                sections.append(None)
+        reused = sum(len(section[2]) for section in sections if section is not None)
+
+        # Slides of sections that changed can still be reused one by one,
+        # provided they were built from the same inputs
+        spare = {}
+        for matches in previous.values():
+            for _, stamps, children in matches:
+                for child_key, part in children:
+                    spare.setdefault((child_key, stamps), []).append(part)
+
+        old_parts = [part for _, _, children in self._sections for _, part in children]
+        built = 0
+        layouts = {}
+        try:
+            for index, key, stamps, spec in pending:
+                slide_cache = None if spec["kind"] in DATA_KINDS else self.cache
+                children = []
+                for child in expand_slides([spec], self.cache):
+                    child_key = slide_key(child, BUILDER_VERSIONS[child["kind"]], TEMPLATE_VERSION)
+                    parts = spare.get((child_key, stamps))
+                    if parts:
+                        part = parts.pop()
+                        reused += 1
+                    else:
+                        part, _ = render_cached(self.prs, child, slide_cache, self.backend, layouts)
+                        built += 1
+                    children.append((child_key, part))
+                sections[index] = (key, stamps, children)
+        except BaseException:
+            self._arrange(old_parts)
+            raise
+
+        self._sections = sections
+        self._arrange([part for _, _, children in sections for _, part in children])
+        return built, reused
+
+    def _arrange(self, parts):
+        # Make `parts` the slide list, in order, and drop every other slide
+        # from the package. Ids and partnames are renumbered in slide order,
+        # as a fresh build numbers them, which compiled.add_slide() relies on.
+        prs_part = self.prs.part
+        sld_id_lst = prs_part._element.get_or_add_sldIdLst()
+        entries = {prs_part.related_part(entry.rId): entry for entry in sld_id_lst}
+        for entry in entries.values():
+            sld_id_lst.remove(entry)
+        keep = set(parts)
+        for part, entry in entries.items():
+            if part not in keep:
+                prs_part.drop_rel(entry.rId)
+        for number, part in enumerate(parts):
+            entry = entries[part]
+            entry.set("id", str(256 + number))
+            sld_id_lst.append(entry)
+        prs_part.rename_slide_parts([entry.rId for entry in sld_id_lst])
+        # Relationships cache their target's partname once serialized
+        for entry in sld_id_lst:
+            rel = prs_part.rels[entry.rId]
+            rel.__dict__.pop("target_partname", None)
+            rel.__dict__.pop("target_ref", None)
+
+    def save(self, out, **save_options):
+        """Write the deck to the path `out` through a temporary file renamed over it.
+
+        `save_options` are those of `proposal.writer.save_deck()`.
+        """
+        if len(self.prs.part._element.get_or_add_sldIdLst()):
+            # Dropped layouts are built again by get_layout() if a later
+            # update needs them
+            prune_unused_layouts(self.prs)
+        out = os.fspath(out)
+        tmp_path = os.path.join(os.path.dirname(out), f".{os.path.basename(out)}.{os.getpid()}.tmp")
+        try:
+            save_deck(self.prs, tmp_path, **save_options)
+            os.replace(tmp_path, out)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def watch(spec_path, out, cache=None, backend="pptx", interval=POLL_INTERVAL, log=sys.stderr, **save_options):
+    """Render `spec_path` to `out`, then rebuild every time it or its inputs change, until interrupted.
+
+    Files are polled every `interval` seconds. Returns the number of rebuilds.
+    """
+    session = DeckSession(cache, backend)
+    rebuilds = 0
+    try:
+        while True:
+            start = time.perf_counter()
+            watched = _stamps([spec_path, *session.inputs])
+            try:
+                spec = validate_spec(load_spec(spec_path))
+                built, reused = session.update(spec["slides"])
+                session.save(out, **save_options)
+            except KeyboardInterrupt:
+                raise
+            except Exception as e:
+                print(f"error: {e}", file=log)
+            else:
+                rebuilds += 1
+                print(f"Rebuilt {out}: {built} built, {reused} reused "
+                      f"({(time.perf_counter() - start) * 1000:.0f} ms)", file=log)
+                # Pick up the inputs of slides the spec just gained
+                watched.update(_stamps(path for path in session.inputs if path not in watched))
+                if rebuilds == 1:
+                    print(f"Watching {len(watched)} files for changes (Ctrl-C to stop)", file=log)
+
+            while _stamps(watched) == watched:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    return rebuilds
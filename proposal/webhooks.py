@@ -0,0 +1,380 @@
+"""
+Webhook receiver rendering a case-file deck for every resolved incident.
+
+Point a partner webhook (see `server/services/webhook.ts`) subscribed to
+`incident.resolved` and/or `incident.status_changed` at this server:
+
+    python -m proposal.webhooks [--port 5003] [--out-dir casefiles] [--secret S]
+                                [--workers 4] [--queue-size 1000] [--batch 32] [--batch-window 0.2]
+                                [--cache-dir .deck-cache | --no-cache]
+
+and `casefiles/<incident id>.pptx` is written shortly after each incident is
+resolved (`proposal.casefile`). Resolution storms, with hundreds of
+incidents resolved in minutes, are absorbed as follows:
+
+- a request only verifies the signature and queues the incident id, then
+  answers 202; rendering happens on a pool of worker threads;
+- the queue is bounded: once `queue_size` incidents are waiting, requests
+  are refused with 503 and `Retry-After` instead of piling up in memory;
+- an incident already waiting is not queued twice, however many events
+  arrive for it;
+- a worker takes every waiting incident (up to `batch`, after waiting
+  `batch_window` seconds for a burst to gather), loads them all in one
+  round of queries and renders them from one pre-built template.
+
+`GET /metrics` reports the queue depth, event counts, batch sizes and the
+time from an event's arrival to its deck being written, as JSON.
+"""
+
+import argparse
+import hashlib
+import hmac
+import io
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .cache import DEFAULT_CACHE_DIR
+from .datasource import PERCENTILES
+
+DEFAULT_OUT_DIR = "casefiles"
+# Samples kept for latency percentiles
+METRICS_WINDOW = 1024
+
+
+class QueueFull(Exception):
+    """Raised by `CaseQueue.put()` when `maxsize` incidents are already waiting."""
+
+
+class CaseQueue:
+    """Bounded FIFO of incident ids waiting for a case file, each held at most once."""
+
+    def __init__(self, maxsize=1000):
+        self.maxsize = maxsize
+        self.high_water = 0
+        self._waiting = OrderedDict()  # incident id -> monotonic time of its first event
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def __len__(self):
+        with self._cond:
+            return len(self._waiting)
+
+    def put(self, incident_id, received=None):
+        """Queue `incident_id`; return False if it is already waiting."""
+        with self._cond:
+            if self._closed:
+                raise QueueFull("queue is closed")
+            if incident_id in self._waiting:
+                return False
+            if len(self._waiting) >= self.maxsize:
+                raise QueueFull(f"{self.maxsize} incidents already waiting")
+            self._waiting[incident_id] = time.monotonic() if received is None else received
+            self.high_water = max(self.high_water, len(self._waiting))
+            self._cond.notify()
+            return True
+
+    def get_batch(self, max_items, window=0.0):
+        """Return up to `max_items` `(incident_id, received)` pairs, oldest first.
+
+        Blocks until an incident is waiting, then up to `window` seconds more
+        for a burst to fill the batch. Returns an empty list once the queue
+        is closed and drained.
+        """
+        with self._cond:
+            while not self._waiting and not self._closed:
+                self._cond.wait()
+            deadline = time.monotonic() + window
+            while 0 < len(self._waiting) < max_items and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return [self._waiting.popitem(last=False) for _ in range(min(max_items, len(self._waiting)))]
+
+    def close(self):
+        """Refuse new incidents and wake the workers to drain what is waiting."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    if not ordered:
+        return {f"p{q}": None for q in PERCENTILES}
+    return {f"p{q}": round(ordered[min(len(ordered) - 1, len(ordered) * q // 100)], 4) for q in PERCENTILES}
+
+
+class Metrics:
+    """Event counters and latency samples, safe to update from any thread."""
+
+    COUNTERS = ("received", "queued", "duplicates", "ignored", "rejected", "invalid",
+                "rendered", "missing", "failed", "batches")
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.counts = dict.fromkeys(self.COUNTERS, 0)
+        self.in_flight = 0
+        self._latency = deque(maxlen=METRICS_WINDOW)  # event arrival to deck written
+        self._render = deque(maxlen=METRICS_WINDOW)   # per deck
+        self._batch_sizes = deque(maxlen=METRICS_WINDOW)
+        self._lock = threading.Lock()
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counts[name] += n
+
+    def batch(self, size):
+        with self._lock:
+            self.counts["batches"] += 1
+            self._batch_sizes.append(size)
+            self.in_flight += size
+
+    def done(self, received, render_seconds, outcome):
+        with self._lock:
+            self.counts[outcome] += 1
+            self.in_flight -= 1
+            if outcome == "rendered":
+                self._latency.append(time.monotonic() - received)
+                self._render.append(render_seconds)
+
+    def snapshot(self, queue):
+        with self._lock:
+            sizes = list(self._batch_sizes)
+            return {
+                "uptime_seconds": round(time.monotonic() - self.started, 1),
+                "queue_depth": len(queue),
+                "queue_capacity": queue.maxsize,
+                "queue_high_water": queue.high_water,
+                "in_flight": self.in_flight,
+                "events": dict(self.counts),
+                "mean_batch_size": round(sum(sizes) / len(sizes), 2) if sizes else None,
+                "latency_seconds": _percentiles(self._latency),
+                "render_seconds": _percentiles(self._render),
+            }
+
+
+def incident_to_render(payload):
+    """Return the incident id a webhook payload asks a case file for, or None."""
+    data = payload.get("data") or {}
+    event = payload.get("event")
+    if event == "incident.resolved" or (event == "incident.status_changed" and data.get("newStatus") == "resolved"):
+        return data.get("id")
+    return None
+
+
+def verify_signature(secret, body, header):
+    """Check an `X-Webhook-Signature` header (`sha256=<hex HMAC of the body>`)."""
+    if not header or not header.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, header[len("sha256="):])
+
+
+class CaseFileService:
+    """Worker pool turning queued incident ids into case-file decks in `out_dir`.
+
+    Photo thumbnails are cached under `cache_dir`, or kept in memory if it is None.
+    """
+
+    def __init__(self, out_dir=DEFAULT_OUT_DIR, database=None, workers=4, queue_size=1000, batch=32,
+                 batch_window=0.2, backend="compiled", uploads_dir=None, cache_dir=DEFAULT_CACHE_DIR):
+        from .templates import template_blob
+
+        self.out_dir = out_dir
+        self.database = database
+        self.batch = batch
+        self.batch_window = batch_window
+        self.backend = backend
+        self.uploads_dir = uploads_dir
+        self.cache_dir = cache_dir
+        self.queue = CaseQueue(queue_size)
+        self.metrics = Metrics()
+        # Every deck starts from the same serialized layouts
+        self._template = template_blob()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"casefile-{i}", daemon=True) for i in range(workers)
+        ]
+        os.makedirs(out_dir, exist_ok=True)
+
+    def start(self):
+        for worker in self._workers:
+            worker.start()
+        return self
+
+    def stop(self):
+        """Finish the incidents already queued, then stop the workers."""
+        self.queue.close()
+        for worker in self._workers:
+            worker.join()
+
+    def submit(self, incident_id, received=None):
+        """Queue a case file for `incident_id`; return "queued" or "duplicate", or raise `QueueFull`."""
+        try:
+            queued = self.queue.put(incident_id, received)
+        except QueueFull:
+            self.metrics.count("rejected")
+            raise
+        self.metrics.count("queued" if queued else "duplicates")
+        return "queued" if queued else "duplicate"
+
+    def path(self, incident_id):
+        safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(incident_id))
+        return os.path.join(self.out_dir, f"{safe}.pptx")
+
+    def _work(self):
+        while True:
+            batch = self.queue.get_batch(self.batch, self.batch_window)
+            if not batch:
+                return
+            self.metrics.batch(len(batch))
+            try:
+                self.render_batch(batch)
+            except Exception as e:
+                # The database couldn't be read; the whole batch fails
+                print(f"error: case-file batch of {len(batch)}: {e}", file=sys.stderr)
+                for _, received in batch:
+                    self.metrics.done(received, 0, "failed")
+
+    def render_batch(self, batch):
+        """Load every incident of `batch` (`(incident_id, received)` pairs) at once and write their decks."""
+        from .casefile import case_file_slides, load_cases
+        from .evidence import THUMBNAIL_CACHE_DIR, UPLOADS_DIR
+        from .render import build_presentation
+        from .writer import save_deck
+
+        cases = load_cases(self.database, [incident_id for incident_id, _ in batch])
+        thumbnail_dir = os.path.join(self.cache_dir, THUMBNAIL_CACHE_DIR) if self.cache_dir else None
+        for incident_id, received in batch:
+            start = time.perf_counter()
+            case = cases.get(incident_id)
+            if case is None:
+                self.metrics.done(received, 0, "missing")
+                continue
+            path = self.path(incident_id)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                slides = case_file_slides(case, self.uploads_dir or UPLOADS_DIR, cache_dir=thumbnail_dir)
+                prs = build_presentation(slides, template=io.BytesIO(self._template), backend=self.backend)
+                save_deck(prs, tmp_path, deterministic=True)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"error: case file for {incident_id}: {e}", file=sys.stderr)
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                self.metrics.done(received, 0, "failed")
+            else:
+                self.metrics.done(received, time.perf_counter() - start, "rendered")
+
+
+class WebhookServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service, secret=None):
+        super().__init__(address, _Handler)
+        self.service = service
+        self.secret = secret
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, headers=()):
+        blob = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(blob)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(blob)
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == "/metrics":
+            return self._send(200, service.metrics.snapshot(service.queue))
+        return self._send(404, {"error": "Not found"})
+
+    def do_POST(self):
+        received = time.monotonic()
+        service = self.server.service
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        service.metrics.count("received")
+
+        secret = self.server.secret
+        if secret and not verify_signature(secret, body, self.headers.get("X-Webhook-Signature")):
+            service.metrics.count("invalid")
+            return self._send(401, {"error": "Invalid signature"})
+        try:
+            payload = json.loads(body)
+            incident_id = incident_to_render(payload)
+        except (ValueError, AttributeError):
+            service.metrics.count("invalid")
+            return self._send(400, {"error": "Expected a JSON webhook payload"})
+        if incident_id is None:
+            service.metrics.count("ignored")
+            return self._send(202, {"status": "ignored"})
+
+        try:
+            status = service.submit(incident_id, received)
+        except QueueFull as e:
+            return self._send(503, {"error": "Busy", "message": str(e)}, [("Retry-After", "5")])
+        return self._send(202, {"status": status, "queueDepth": len(service.queue)})
+
+
+def serve(service, port=0, secret=None):
+    """Start the workers of `service` and a webhook server for it on a background thread; return the server."""
+    service.start()
+    server = WebhookServer(("127.0.0.1", port), service, secret)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a case-file deck for every incident a webhook reports resolved.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=5003, help="port to listen on (default: %(default)s)")
+    parser.add_argument("--out-dir", default=DEFAULT_OUT_DIR, help="where case files are written (default: %(default)s)")
+    parser.add_argument("--database", help="SQLite database to read incidents from (default: DATABASE_URL)")
+    parser.add_argument("--secret", default=os.environ.get("WEBHOOK_SECRET"),
+                        help="webhook secret to verify X-Webhook-Signature with (default: WEBHOOK_SECRET)")
+    parser.add_argument("--workers", type=int, default=4, help="rendering threads (default: %(default)s)")
+    parser.add_argument("--queue-size", type=int, default=1000, help="incidents waiting before 503s (default: %(default)s)")
+    parser.add_argument("--batch", type=int, default=32, help="incidents loaded and rendered together (default: %(default)s)")
+    parser.add_argument("--batch-window", type=float, default=0.2,
+                        help="seconds a worker waits for a burst to fill a batch (default: %(default)s)")
+    parser.add_argument("--backend", choices=("pptx", "compiled"), default="compiled",
+                        help="slide backend (default: %(default)s)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="directory for cached photo thumbnails (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="keep thumbnails in memory only")
+    args = parser.parse_args(argv)
+
+    service = CaseFileService(
+        args.out_dir, args.database, args.workers, args.queue_size, args.batch, args.batch_window, args.backend,
+        cache_dir=None if args.no_cache else args.cache_dir,
+    ).start()
+    server = WebhookServer((args.host, args.port), service, args.secret)
+    print(f"Case-file webhooks on http://{args.host}:{args.port}/ (metrics at /metrics), writing to {args.out_dir}",
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+        print(json.dumps(service.metrics.snapshot(service.queue), indent=2), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
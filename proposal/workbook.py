@@ -0,0 +1,174 @@
+"""
+Fast, deterministic workbooks embedded behind native charts.
+
+python-pptx writes each chart's embedded workbook with XlsxWriter, cell by
+cell. It also stamps the workbook with the current time, so a deck holding a
+chart is never byte-identical between runs. `WorkbookChartData` is a
+`CategoryChartData` whose workbook is one worksheet of inline cells. That
+is all the chart's references point at, and it is written in a single join
+and zipped with fixed timestamps. Hierarchical categories fall back to
+python-pptx's writer.
+"""
+
+import datetime
+import io
+import zipfile
+from xml.sax.saxutils import escape
+
+from pptx.chart.data import CategoryChartData
+from pptx.chart.xlsx import CategoryWorkbookWriter
+from pptx.util import lazyproperty
+
+from .writer import FIXED_DATE_TIME
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    "</Types>"
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    "</Relationships>"
+)
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    "{num_fmts}"
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="{xf_count}">{xfs}</cellXfs>'
+    "</styleSheet>"
+)
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_END = "</sheetData></worksheet>"
+_QUOT = {'"': "&quot;"}
+
+# Excel's day zero, allowing for its phantom 29 February 1900
+_EXCEL_EPOCH = datetime.datetime(1899, 12, 30)
+
+
+def _column(number):
+    return CategoryWorkbookWriter._column_reference(number)
+
+
+def _excel_date(value):
+    if not isinstance(value, datetime.datetime):
+        value = datetime.datetime(value.year, value.month, value.day)
+    delta = value.replace(tzinfo=None) - _EXCEL_EPOCH
+    return delta.days + delta.seconds / 86400
+
+
+def _cell(ref, value, style):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"{style}><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"{style}><v>{value!r}</v></c>'
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return f'<c r="{ref}"{style}><v>{_excel_date(value)!r}</v></c>'
+    return f'<c r="{ref}" t="inlineStr"{style}><is><t xml:space="preserve">{escape(str(value))}</t></is></c>'
+
+
+class _FastWorkbookWriter(CategoryWorkbookWriter):
+    @property
+    def xlsx_blob(self):
+        chart_data = self._chart_data
+        categories = chart_data.categories
+        if categories.depth != 1:
+            return super().xlsx_blob
+
+        # One cell style per distinct number format other than General
+        formats = {}
+
+        def style(number_format):
+            if number_format == "General":
+                return ""
+            if number_format not in formats:
+                formats[number_format] = len(formats) + 1
+            return f' s="{formats[number_format]}"'
+
+        category_style = style(categories.number_format)
+        columns = [(_column(2 + index), style(series.number_format), series.values)
+                   for index, series in enumerate(chart_data)]
+
+        rows = ['<row r="1">' + "".join(
+            _cell(f"{column}1", series.name, "") for (column, _, _), series in zip(columns, chart_data)
+        ) + "</row>"]
+        for index, category in enumerate(categories):
+            r = index + 2
+            cells = [_cell(f"A{r}", category.label, category_style)]
+            for column, value_style, values in columns:
+                cells.append(_cell(f"{column}{r}", values[index] if index < len(values) else None, value_style))
+            rows.append(f'<row r="{r}">{"".join(cells)}</row>')
+
+        num_fmts = "".join(
+            f'<numFmt numFmtId="{163 + xf}" formatCode="{escape(code, _QUOT)}"/>'
+            for code, xf in formats.items()
+        )
+        styles = _STYLES.format(
+            num_fmts=f'<numFmts count="{len(formats)}">{num_fmts}</numFmts>' if formats else "",
+            xf_count=len(formats) + 1,
+            xfs='<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>' + "".join(
+                f'<xf numFmtId="{163 + xf}" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+                for xf in formats.values()
+            ),
+        )
+
+        members = [
+            ("[Content_Types].xml", _CONTENT_TYPES),
+            ("_rels/.rels", _ROOT_RELS),
+            ("xl/workbook.xml", _WORKBOOK),
+            ("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS),
+            ("xl/styles.xml", styles),
+            ("xl/worksheets/sheet1.xml", _SHEET_START + "".join(rows) + _SHEET_END),
+        ]
+        stream = io.BytesIO()
+        with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, xml in members:
+                zf.writestr(zipfile.ZipInfo(name, FIXED_DATE_TIME), xml.encode("utf-8"), zipfile.ZIP_DEFLATED)
+        return stream.getvalue()
+
+
+class WorkbookChartData(CategoryChartData):
+    """`CategoryChartData` whose embedded workbook is written by `_FastWorkbookWriter`."""
+
+    @lazyproperty
+    def _workbook_writer(self):
+        return _FastWorkbookWriter(self)
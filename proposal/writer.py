@@ -0,0 +1,92 @@
+"""
+Write a Presentation as a .pptx package to a path or any writable stream.
+
+python-pptx always deflates with the default level and stamps every ZIP
+member with the current time. `save_deck()` writes the same parts but lets
+callers choose the compression (ZIP_STORED is much faster for intermediate
+artifacts), stream to non-seekable outputs such as stdout or a socket, and
+produce deterministic output: fixed member timestamps and permissions, and
+parts in partname order, so identical specs yield byte-identical decks.
+"""
+
+import os
+import sys
+import time
+import zipfile
+
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from pptx.opc.serialized import _ContentTypesItem
+
+COMPRESSION = {
+    "deflated": zipfile.ZIP_DEFLATED,
+    "stored": zipfile.ZIP_STORED,
+}
+
+# Earliest timestamp a ZIP member can carry
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def iter_package_items(prs, deterministic=False, profiler=None):
+    """Generate `(member_name, blob)` for every item of the package behind `prs`.
+
+    Blobs are serialized lazily, one member at a time; with a `profiler`,
+    each serialization is recorded.
+    """
+    package = prs.part.package
+    parts = list(package.iter_parts())
+    if deterministic:
+        parts.sort(key=lambda part: part.partname)
+
+    items = [
+        (CONTENT_TYPES_URI.membername, lambda: serialize_part_xml(_ContentTypesItem.xml_for(parts))),
+        (PACKAGE_URI.rels_uri.membername, lambda: package._rels.xml),
+    ]
+    for part in parts:
+        items.append((part.partname.membername, lambda part=part: part.blob))
+        if part._rels:
+            items.append((part.partname.rels_uri.membername, lambda part=part: part.rels.xml))
+
+    for name, serialize in items:
+        if profiler is None:
+            yield name, serialize()
+        else:
+            yield name, profiler.member(name, serialize)
+
+
+def write_package(prs, stream, compression="deflated", compress_level=None, deterministic=False, profiler=None):
+    """Write the package behind `prs` to the binary `stream`, which need not be seekable."""
+    compress_type = COMPRESSION[compression]
+    with zipfile.ZipFile(stream, "w", compression=compress_type, compresslevel=compress_level) as zf:
+        for name, blob in iter_package_items(prs, deterministic, profiler):
+            if deterministic:
+                info = zipfile.ZipInfo(name, FIXED_DATE_TIME)
+                info.external_attr = 0o644 << 16
+                zf.writestr(info, blob, compress_type=compress_type, compresslevel=compress_level)
+            else:
+                zf.writestr(name, blob)
+
+
+def save_deck(prs, out, compression="deflated", compress_level=None, deterministic=False, profiler=None):
+    """Save `prs` to `out`: a filesystem path, a writable binary stream, or "-" for stdout.
+
+    `compression` is "deflated" (the python-pptx default) or "stored";
+    `compress_level` (0-9) tunes deflate. With `deterministic`, the output
+    depends only on the slides rendered into `prs`. A `proposal.profiling.Profiler`
+    records the whole save and the serialization of every member.
+    """
+    start = time.perf_counter()
+    options = dict(
+        compression=compression, compress_level=compress_level, deterministic=deterministic, profiler=profiler
+    )
+    if out == "-":
+        write_package(prs, sys.stdout.buffer, **options)
+        sys.stdout.buffer.flush()
+    elif hasattr(out, "write"):
+        write_package(prs, out, **options)
+    else:
+        with open(os.fspath(out), "wb") as f:
+            write_package(prs, f, **options)
+
+    if profiler is not None:
+        profiler.span("save", "save", start, time.perf_counter(), compression=compression)